@@ -1,6 +1,6 @@
 {
     "name": "Veterinary Clinic",
-    "version": "17.0.1.0.0",
+    "version": "17.0.1.6.0",
     "category": "Healthcare",
     "summary": """
         Veterinary clinic management system with patient records,
@@ -15,6 +15,9 @@
         "calendar",
         "resource_booking",
     ],
+    "external_dependencies": {
+        "python": ["numpy"],
+    },
     "data": [
         "security/vet_clinic_security.xml",
         "security/ir.model.access.csv",
@@ -22,18 +25,26 @@
         "data/vet_provider_type_data.xml",
         "data/vet_room_data.xml",
         "data/resource_booking_type_data.xml",
+        "data/ir_cron_data.xml",
         "views/vet_provider_type_views.xml",
         "views/vet_room_views.xml",
+        "views/res_config_settings_views.xml",
         "views/res_users_views.xml",
         "views/vet_owner_views.xml",
         "views/resource_booking_views.xml",
         "views/vet_appointment_views.xml",
+        "views/vet_appointment_series_views.xml",
+        "views/vet_medical_note_views.xml",
+        "views/vet_problem_views.xml",
         "views/vet_patient_views.xml",
+        "wizard/vet_appointment_reschedule_views.xml",
         "views/vet_menu.xml",
     ],
     "demo": [
         "demo/res_partner_demo.xml",
         "demo/vet_patient_demo.xml",
+        "demo/vet_medical_note_demo.xml",
+        "demo/vet_problem_demo.xml",
     ],
     "installable": True,
     "application": True,
@@ -0,0 +1,50 @@
+from odoo import fields, http
+from odoo.http import request
+
+
+class VetClinicController(http.Controller):
+    @http.route("/vet_clinic/free_slots", type="json", auth="user")
+    def free_slots(
+        self,
+        date_from,
+        date_to,
+        duration=None,
+        appointment_type="checkup",
+        provider_ids=None,
+        room_ids=None,
+        limit=20,
+    ):
+        """Return the free appointment slots for providers and/or rooms"""
+        slots = request.env["vet.appointment"].find_free_slots(
+            date_from,
+            date_to,
+            duration=duration,
+            appointment_type=appointment_type,
+            provider_ids=provider_ids,
+            room_ids=room_ids,
+            limit=min(int(limit), 200),
+        )
+        return [
+            dict(
+                slot,
+                start=fields.Datetime.to_string(slot["start"]),
+                stop=fields.Datetime.to_string(slot["stop"]),
+            )
+            for slot in slots
+        ]
+
+    @http.route("/vet_clinic/quick_find", type="json", auth="user")
+    def quick_find(self, term, limit=20):
+        """Return the patients and owners best matching ``term``"""
+        return request.env["vet.patient"].quick_find(term, limit=min(int(limit), 100))
+
+    @http.route("/vet_clinic/microchip", type="json", auth="user")
+    def microchip_lookup(self, microchip_number):
+        """Return the patient, owner and next appointment of a scanned chip"""
+        return request.env["vet.patient"].microchip_lookup(microchip_number)
+
+    @http.route("/vet_clinic/timeline", type="json", auth="user")
+    def timeline(self, patient_id, cursor=None, limit=40):
+        """Return one page of the medical timeline of a patient"""
+        patient = request.env["vet.patient"].browse(int(patient_id))
+        return patient.get_timeline(cursor=cursor, limit=min(int(limit), 200))
@@ -0,0 +1,50 @@
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+def migrate(cr, version):
+    """Normalize microchip numbers before their unique constraint is added.
+
+    A number shared by several patients is kept on the oldest one; it is
+    removed from the others and recorded in their medical notes.
+    """
+    cr.execute(
+        r"""
+        UPDATE vet_patient
+           SET microchip_number = NULLIF(
+                   regexp_replace(microchip_number, '[\s.\-]', '', 'g'), ''
+               )
+         WHERE microchip_number ~ '[\s.\-]' OR microchip_number = ''
+        """
+    )
+    cr.execute(
+        """
+        WITH duplicate AS (
+            SELECT id,
+                   microchip_number,
+                   min(id) OVER (PARTITION BY microchip_number) AS keep_id
+              FROM vet_patient
+             WHERE microchip_number IS NOT NULL
+        )
+        UPDATE vet_patient patient
+           SET microchip_number = NULL,
+               medical_notes = concat_ws(
+                   E'\\n',
+                   patient.medical_notes,
+                   'Duplicate microchip number removed: '
+                       || duplicate.microchip_number
+               )
+          FROM duplicate
+         WHERE patient.id = duplicate.id AND duplicate.id != duplicate.keep_id
+     RETURNING patient.id, duplicate.microchip_number, duplicate.keep_id
+        """
+    )
+    for patient_id, microchip_number, keep_id in cr.fetchall():
+        _logger.warning(
+            "Microchip number %s of patient %s is already used by patient %s, "
+            "it has been removed",
+            microchip_number,
+            patient_id,
+            keep_id,
+        )
@@ -0,0 +1,7 @@
+from odoo import SUPERUSER_ID, api
+
+
+def migrate(cr, version):
+    """Generate the thumbnails of the existing patient photos in the background"""
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    env.ref("vet_clinic.ir_cron_backfill_patient_images")._trigger()
@@ -0,0 +1,48 @@
+def migrate(cr, version):
+    """Build the weight history from the tracked weight changes.
+
+    Patients whose weight was never tracked get their current weight as
+    their first measurement.
+    """
+    cr.execute(
+        """
+        INSERT INTO vet_weight_measurement (
+            patient_id, species_id, date, weight, age_days,
+            create_uid, create_date, write_uid, write_date
+        )
+        SELECT patient.id,
+               patient.species_id,
+               history.date,
+               history.weight,
+               COALESCE(history.date::date - patient.birth_date, 0),
+               1, NOW() AT TIME ZONE 'UTC', 1, NOW() AT TIME ZONE 'UTC'
+          FROM (
+                SELECT message.res_id AS patient_id,
+                       message.date,
+                       value.new_value_float AS weight
+                  FROM mail_tracking_value value
+                  JOIN mail_message message ON message.id = value.mail_message_id
+                  JOIN ir_model_fields field ON field.id = value.field_id
+                 WHERE message.model = 'vet.patient'
+                   AND field.model = 'vet.patient'
+                   AND field.name = 'weight'
+                   AND value.new_value_float > 0
+             UNION ALL
+                SELECT id, COALESCE(write_date, create_date), weight
+                  FROM vet_patient
+                 WHERE weight > 0
+                   AND NOT EXISTS (
+                           SELECT 1
+                             FROM mail_message message
+                             JOIN mail_tracking_value value
+                               ON value.mail_message_id = message.id
+                             JOIN ir_model_fields field ON field.id = value.field_id
+                            WHERE message.model = 'vet.patient'
+                              AND message.res_id = vet_patient.id
+                              AND field.model = 'vet.patient'
+                              AND field.name = 'weight'
+                       )
+               ) history
+          JOIN vet_patient patient ON patient.id = history.patient_id
+        """
+    )
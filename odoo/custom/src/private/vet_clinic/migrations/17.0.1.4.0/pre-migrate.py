@@ -0,0 +1,66 @@
+from odoo.tools.sql import column_exists
+
+MEDICAL_RECORD_FIELDS = ["reason", "diagnosis", "treatment", "prescription", "notes"]
+
+
+def _move_medical_records(cr, table):
+    """Move the clinical text of ``table`` into one medical record per row"""
+    if not column_exists(cr, table, "reason"):
+        return
+    columns = ", ".join(MEDICAL_RECORD_FIELDS)
+    drops = ", ".join(f"DROP COLUMN {fname}" for fname in MEDICAL_RECORD_FIELDS)
+    cr.execute(
+        f"""
+        ALTER TABLE {table} ADD COLUMN IF NOT EXISTS medical_record_id integer;
+        INSERT INTO vet_medical_record (
+            {columns}, legacy_res_model, legacy_res_id,
+            create_uid, create_date, write_uid, write_date
+        )
+        SELECT {columns}, %(table)s, id,
+               create_uid, create_date, write_uid, write_date
+          FROM {table}
+         WHERE medical_record_id IS NULL;
+        UPDATE {table}
+           SET medical_record_id = record.id
+          FROM vet_medical_record record
+         WHERE record.legacy_res_model = %(table)s
+           AND record.legacy_res_id = {table}.id;
+        ALTER TABLE {table} {drops};
+        """,
+        {"table": table},
+    )
+
+
+def migrate(cr, version):
+    """Split the clinical text off the appointment and booking tables.
+
+    The medical record table is created ahead of the ORM so that every
+    existing row gets its record before the column becomes required.
+    """
+    cr.execute(
+        """
+        CREATE TABLE IF NOT EXISTS vet_medical_record (
+            id SERIAL PRIMARY KEY,
+            reason text,
+            diagnosis text,
+            treatment text,
+            prescription text,
+            notes text,
+            legacy_res_model varchar,
+            legacy_res_id integer,
+            create_uid integer,
+            create_date timestamp without time zone,
+            write_uid integer,
+            write_date timestamp without time zone
+        )
+        """
+    )
+    for table in ("vet_appointment", "resource_booking"):
+        _move_medical_records(cr, table)
+    cr.execute(
+        """
+        ALTER TABLE vet_medical_record
+            DROP COLUMN legacy_res_model,
+            DROP COLUMN legacy_res_id
+        """
+    )
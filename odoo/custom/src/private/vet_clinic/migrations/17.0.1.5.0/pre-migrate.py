@@ -0,0 +1,94 @@
+from odoo import SUPERUSER_ID, api
+from odoo.tools import split_every
+from odoo.tools.sql import column_exists
+
+# Owner columns replaced by the fields of their partner
+PARTNER_FIELDS = [
+    "name",
+    "email",
+    "phone",
+    "mobile",
+    "street",
+    "street2",
+    "city",
+    "state_id",
+    "zip",
+    "country_id",
+]
+CHUNK_SIZE = 5000
+
+
+def _create_missing_partners(env):
+    """Give a partner to the owners that have none"""
+    cr = env.cr
+    cr.execute(
+        f"""
+        SELECT id, {", ".join(PARTNER_FIELDS)}
+          FROM vet_owner
+         WHERE partner_id IS NULL
+      ORDER BY id
+        """
+    )
+    for rows in split_every(CHUNK_SIZE, cr.dictfetchall()):
+        partners = env["res.partner"].create(
+            [
+                {
+                    **{fname: row[fname] for fname in PARTNER_FIELDS},
+                    "comment": f"Pet Owner - {row['name']}",
+                }
+                for row in rows
+            ]
+        )
+        cr.execute(
+            """
+            UPDATE vet_owner
+               SET partner_id = owner_partner.partner_id
+              FROM unnest(%s::int[], %s::int[]) AS owner_partner(id, partner_id)
+             WHERE vet_owner.id = owner_partner.id
+            """,
+            [[row["id"] for row in rows], partners.ids],
+        )
+
+
+def _copy_owner_values(env):
+    """Copy the contact values of the owners onto their partners, by chunks"""
+    cr = env.cr
+    cr.execute("SELECT id FROM vet_owner ORDER BY id")
+    owner_ids = [row[0] for row in cr.fetchall()]
+    assignments = ", ".join(f"{fname} = owner.{fname}" for fname in PARTNER_FIELDS)
+    for ids in split_every(CHUNK_SIZE, owner_ids, tuple):
+        cr.execute(
+            f"""
+            UPDATE res_partner
+               SET {assignments}
+              FROM vet_owner owner
+             WHERE owner.partner_id = res_partner.id
+               AND owner.id IN %s
+         RETURNING res_partner.id
+            """,
+            [ids],
+        )
+        partners = env["res.partner"].browse(row[0] for row in cr.fetchall())
+        # Recompute what depends on the copied values, e.g. the display name
+        partners.invalidate_recordset(PARTNER_FIELDS)
+        partners.modified(PARTNER_FIELDS)
+        env.flush_all()
+        env.invalidate_all()
+
+
+def migrate(cr, version):
+    """Move the contact details of the owners to their partner.
+
+    The owners now delegate these fields to res.partner, so the partner
+    copy becomes the only one and the owner columns are dropped.
+    """
+    if not column_exists(cr, "vet_owner", "email"):
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    _create_missing_partners(env)
+    _copy_owner_values(env)
+    cr.execute(
+        "ALTER TABLE vet_owner {}".format(
+            ", ".join(f"DROP COLUMN {fname}" for fname in PARTNER_FIELDS)
+        )
+    )
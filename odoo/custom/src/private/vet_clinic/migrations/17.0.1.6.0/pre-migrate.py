@@ -0,0 +1,66 @@
+from odoo import SUPERUSER_ID, api
+from odoo.tools.sql import SQL, column_exists
+
+
+def migrate(cr, version):
+    """Fill the resource key of the combinations and merge the duplicates.
+
+    Combinations with the same resources are merged into the oldest one,
+    so that the unique constraint on the key can be added.
+    """
+    if column_exists(cr, "resource_booking_combination", "resource_key"):
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    field = env["resource.booking.combination"]._fields["resource_ids"]
+    cr.execute(
+        SQL(
+            """
+            ALTER TABLE resource_booking_combination
+                ADD COLUMN resource_key varchar;
+            UPDATE resource_booking_combination combination
+               SET resource_key = (
+                       SELECT string_agg(
+                                  rel.%(resource)s::varchar, ','
+                                  ORDER BY rel.%(resource)s
+                              )
+                         FROM %(relation)s rel
+                        WHERE rel.%(combination)s = combination.id
+                   )
+            """,
+            relation=SQL.identifier(field.relation),
+            combination=SQL.identifier(field.column1),
+            resource=SQL.identifier(field.column2),
+        )
+    )
+    cr.execute(
+        """
+        SELECT array_agg(id ORDER BY id)
+          FROM resource_booking_combination
+         WHERE resource_key IS NOT NULL
+      GROUP BY resource_key
+        HAVING count(*) > 1
+        """
+    )
+    for keep_id, *duplicate_ids in (row[0] for row in cr.fetchall()):
+        duplicate_ids = tuple(duplicate_ids)
+        cr.execute(
+            """
+            UPDATE resource_booking
+               SET combination_id = %(keep)s
+             WHERE combination_id IN %(duplicates)s;
+            DELETE FROM resource_booking_type_combination_rel rel
+             WHERE combination_id IN %(duplicates)s
+               AND EXISTS (
+                       SELECT 1
+                         FROM resource_booking_type_combination_rel other
+                        WHERE other.type_id = rel.type_id
+                          AND other.combination_id = %(keep)s
+                   );
+            UPDATE resource_booking_type_combination_rel
+               SET combination_id = %(keep)s
+             WHERE combination_id IN %(duplicates)s;
+            DELETE FROM resource_booking_combination
+             WHERE id IN %(duplicates)s;
+            """,
+            {"keep": keep_id, "duplicates": duplicate_ids},
+        )
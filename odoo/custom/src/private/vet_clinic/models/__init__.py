@@ -1,3 +1,5 @@
+from . import vet_bulk_mixin
+from . import vet_medical_record
 from . import vet_patient
 from . import vet_owner
 from . import vet_species
@@ -5,4 +7,11 @@ from . import vet_provider_type
 from . import vet_room
 from . import res_users
 from . import resource_booking
+from . import resource_booking_combination
 from . import vet_appointment
+from . import res_config_settings
+from . import ir_sequence
+from . import vet_appointment_series
+from . import vet_weight_measurement
+from . import vet_medical_note
+from . import vet_problem
@@ -0,0 +1,26 @@
+from odoo import fields, models
+
+from ..utils import DOUBLE_BOOKING_PARAM
+
+
+class ResConfigSettings(models.TransientModel):
+    _inherit = "res.config.settings"
+
+    vet_prevent_double_booking = fields.Boolean(
+        string="Prevent Double Booking",
+        config_parameter=DOUBLE_BOOKING_PARAM,
+        help=(
+            "Reject appointments and bookings that overlap another one with the "
+            "same provider or room, enforced by the database"
+        ),
+    )
+
+    def set_values(self):
+        """Add or drop the exclusion constraints when the setting changes"""
+        super().set_values()
+        self.env["vet.appointment"]._update_double_booking_constraints(
+            raise_if_failed=True
+        )
+        self.env["resource.booking"]._update_double_booking_constraints(
+            raise_if_failed=True
+        )
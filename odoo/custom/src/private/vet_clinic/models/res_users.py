@@ -1,4 +1,8 @@
 from odoo import api, fields, models
+from odoo.tools import groupby
+
+# User fields that may change the linked provider resource
+PROVIDER_RESOURCE_FIELDS = {"provider_type_id", "name", "active"}
 
 
 class ResUsers(models.Model):
@@ -20,6 +24,7 @@ class ResUsers(models.Model):
         "resource.resource",
         string="Provider Resource",
         ondelete="set null",
+        copy=False,
         help="Linked resource for booking system",
     )
 
@@ -27,42 +32,71 @@ class ResUsers(models.Model):
     def create(self, vals_list):
         """Create linked resource for providers"""
         users = super().create(vals_list)
-        for user in users:
-            user._ensure_provider_resource()
+        users._sync_provider_resources()
         return users
 
     def write(self, vals):
         """Sync changes to linked resource"""
         result = super().write(vals)
-        # Check if provider status changed
-        if "provider_type_id" in vals or "name" in vals:
-            for user in self:
-                user._ensure_provider_resource()
+        if not PROVIDER_RESOURCE_FIELDS.isdisjoint(vals):
+            self._sync_provider_resources()
         return result
 
-    def _ensure_provider_resource(self):
-        """Ensure provider has a linked resource if they are a provider"""
-        self.ensure_one()
-        if self.is_provider and not self.provider_resource_id:
-            # Create resource for this provider
-            resource = self.env["resource.resource"].create(
-                {
-                    "name": self.name,
-                    "resource_type": "user",
-                    "user_id": self.id,
-                    "active": self.active,
-                }
+    def _sync_provider_resources(self):
+        """Reconcile the linked resources of the users with their provider status.
+
+        Missing resources are created in one batch, outdated ones are written
+        once per group of identical values and the resources of users who are
+        no longer providers are removed at once. A resource shared by several
+        users stays with the oldest provider; the other providers get their
+        own and the other users are detached from it.
+        """
+        linked = (
+            self.with_context(active_test=False)
+            .search([("provider_resource_id", "in", self.provider_resource_id.ids)])
+            .sorted("id")
+        )
+        resource_owners = {}
+        for user in linked.filtered("is_provider"):
+            resource_owners.setdefault(user.provider_resource_id, user)
+
+        providers = self.filtered("is_provider")
+        to_create = providers.filtered(
+            lambda user: resource_owners.get(user.provider_resource_id) != user
+        )
+        to_update = (providers - to_create).filtered(
+            lambda user: (
+                user.provider_resource_id.name != user.name
+                or user.provider_resource_id.active != user.active
+            )
+        )
+        to_detach = (self - providers).filtered(
+            lambda user: user.provider_resource_id in resource_owners
+        )
+        to_remove = (self - providers - to_detach).provider_resource_id
+
+        if to_create:
+            resources = self.env["resource.resource"].create(
+                [
+                    {
+                        "name": user.name,
+                        "resource_type": "user",
+                        "user_id": user.id,
+                        "active": user.active,
+                    }
+                    for user in to_create
+                ]
             )
-            self.provider_resource_id = resource
-        elif self.is_provider and self.provider_resource_id:
-            # Update existing resource
-            self.provider_resource_id.write(
-                {
-                    "name": self.name,
-                    "active": self.active,
-                }
+            for user, resource in zip(to_create, resources, strict=True):
+                user.provider_resource_id = resource
+        for (name, active), users in groupby(
+            to_update, key=lambda user: (user.name, user.active)
+        ):
+            self.browse().union(*users).provider_resource_id.write(
+                {"name": name, "active": active}
             )
-        elif not self.is_provider and self.provider_resource_id:
-            # Remove resource if no longer a provider
-            self.provider_resource_id.unlink()
-            self.provider_resource_id = False
+        if to_detach:
+            to_detach.provider_resource_id = False
+        if to_remove:
+            # The links are cleared by their ondelete="set null"
+            to_remove.unlink()
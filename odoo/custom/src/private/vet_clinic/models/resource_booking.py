@@ -1,13 +1,54 @@
+from collections import defaultdict
+
 from odoo import api, fields, models
+from odoo.tools.sql import create_index
+
+from ..utils import (
+    double_booking_guard,
+    is_double_booking_prevented,
+    update_exclusion_constraints,
+)
+from .resource_booking_combination import _resource_key
+
+# Fields that decide whether two bookings conflict
+SCHEDULING_FIELDS = ["start", "stop", "room_id", "provider_id", "state", "active"]
+
+
+def _booking_name(patient, booking_type, start):
+    """Return a meaningful name for a booking"""
+    parts = []
+    if patient:
+        parts.append(patient.name)
+    if booking_type:
+        parts.append(booking_type.name)
+    if start:
+        # Format: YYYY-MM-DD HH:MM
+        parts.append(start.strftime("%Y-%m-%d %H:%M"))
+    return " - ".join(parts) if parts else "Appointment"
 
 
 class ResourceBooking(models.Model):
     _inherit = "resource.booking"
+    _inherits = {"vet.medical.record": "medical_record_id"}
 
     # Override to disable auto-assignment by default for vet workflow
     combination_auto_assign = fields.Boolean(default=False)
 
+    # Generated from the patient, type and start, and editable by hand
+    name = fields.Char(
+        compute="_compute_name", store=True, readonly=False, precompute=True
+    )
+
     # Vet-specific fields
+    # Clinical text lives in vet.medical.record, read only when displayed
+    medical_record_id = fields.Many2one(
+        "vet.medical.record",
+        string="Medical Record",
+        required=True,
+        ondelete="restrict",
+        auto_join=True,
+        index=True,
+    )
     patient_id = fields.Many2one(
         "vet.patient",
         string="Patient",
@@ -38,25 +79,6 @@ class ResourceBooking(models.Model):
         if attendees:
             self.partner_ids = attendees
 
-    # Medical information
-    reason = fields.Text(
-        string="Reason for Visit",
-        help="Primary reason for the appointment",
-    )
-    diagnosis = fields.Text(
-        help="Diagnosis determined during the appointment",
-    )
-    treatment = fields.Text(
-        help="Treatment plan for the patient",
-    )
-    prescription = fields.Text(
-        help="Medications prescribed",
-    )
-    notes = fields.Text(
-        string="Additional Notes",
-        help="Any additional notes about the appointment",
-    )
-
     # Link to room and provider
     room_id = fields.Many2one(
         "vet.room",
@@ -91,144 +113,206 @@ class ResourceBooking(models.Model):
             return
 
         # Try to find existing combination with these exact resources
-        existing_combination = self.env["resource.booking.combination"].search(
-            [("resource_ids", "=", resources.ids)], limit=1
-        )
+        existing_combination = self.env[
+            "resource.booking.combination"
+        ]._find_by_resources(resources)
 
         if existing_combination:
             self.combination_id = existing_combination
 
     def _get_or_create_combination(self, room, provider):
         """Get or create a combination for the given room and provider"""
-        # Collect resources
-        resources = self.env["resource.resource"]
-        if room and room.resource_id:
-            resources |= room.resource_id
-        if provider and provider.provider_resource_id:
-            resources |= provider.provider_resource_id
-
-        if not resources:
-            return False
-
-        # Try to find existing combination with these exact resources
-        existing_combination = self.env["resource.booking.combination"].search(
-            [("resource_ids", "=", resources.ids)], limit=1
+        pair = (room.id, provider.id)
+        return self._get_or_create_combinations([pair]).get(pair, False)
+
+    @api.model
+    def _get_or_create_combinations(self, pairs):
+        """Return the combination of each ``(room_id, provider_id)`` pair.
+
+        The rooms and providers are read together, then all the combinations
+        are found or created at once. Pairs without any resource are left out.
+        """
+        pairs = set(pairs)
+        rooms = self.env["vet.room"].browse(
+            {room_id for room_id, _p in pairs if room_id}
         )
-
-        if existing_combination:
-            return existing_combination
-
-        # Create new combination
-        new_combination = self.env["resource.booking.combination"].create(
-            {
-                "resource_ids": [(6, 0, resources.ids)],
-            }
+        providers = self.env["res.users"].browse(
+            {provider_id for _r, provider_id in pairs if provider_id}
+        )
+        # Read all the linked resources with one query per model
+        rooms.mapped("resource_id")
+        providers.mapped("provider_resource_id")
+        resources = {
+            (room_id, provider_id): (
+                rooms.browse(room_id).resource_id
+                | providers.browse(provider_id).provider_resource_id
+            )
+            for room_id, provider_id in pairs
+        }
+        combinations = self.env[
+            "resource.booking.combination"
+        ]._get_or_create_by_resources(resources.values())
+        return {
+            pair: combinations[_resource_key(pair_resources.ids)]
+            for pair, pair_resources in resources.items()
+            if pair_resources
+        }
+
+    @api.model
+    def _link_type_combinations(self, links):
+        """Make sure each ``(type_id, combination_id)`` pair of ``links`` is linked"""
+        if not links:
+            return
+        TypeCombination = self.env["resource.booking.type.combination.rel"]
+        existing = TypeCombination.search(
+            [
+                ("type_id", "in", list({type_id for type_id, _c in links})),
+                ("combination_id", "in", list({comb_id for _t, comb_id in links})),
+            ]
+        )
+        missing = set(links) - {
+            (link.type_id.id, link.combination_id.id) for link in existing
+        }
+        TypeCombination.create(
+            [
+                {"type_id": type_id, "combination_id": combination_id, "sequence": 10}
+                for type_id, combination_id in sorted(missing)
+            ]
         )
-        return new_combination
 
     @api.model_create_multi
     def create(self, vals_list):
-        """Ensure combination is created from room/provider on create"""
-        for vals in vals_list:
-            if "room_id" in vals or "provider_id" in vals:
-                room = self.env["vet.room"].browse(vals.get("room_id", False))
-                provider = self.env["res.users"].browse(vals.get("provider_id", False))
-                combination = self._get_or_create_combination(room, provider)
-                if combination:
-                    vals["combination_id"] = combination.id
-                    # Link to booking type if creating
-                    if vals.get("type_id") and not self.env[
-                        "resource.booking.type.combination.rel"
-                    ].search(
-                        [
-                            ("type_id", "=", vals["type_id"]),
-                            ("combination_id", "=", combination.id),
-                        ]
-                    ):
-                        self.env["resource.booking.type.combination.rel"].create(
-                            {
-                                "type_id": vals["type_id"],
-                                "combination_id": combination.id,
-                                "sequence": 10,
-                            }
-                        )
-
-        bookings = super().create(vals_list)
-
-        # Auto-generate name for each booking
-        for booking in bookings:
-            if not booking.name or booking.name == "New":
-                booking.name = booking._generate_name()
-
+        """Resolve combinations and type links once per room/provider/type group"""
+        pairs = [
+            (vals.get("room_id") or False, vals.get("provider_id") or False)
+            if "room_id" in vals or "provider_id" in vals
+            else None
+            for vals in vals_list
+        ]
+        combinations = self._get_or_create_combinations(filter(None, pairs))
+        links = set()
+        for vals, pair in zip(vals_list, pairs, strict=True):
+            combination = combinations.get(pair)
+            if combination:
+                vals["combination_id"] = combination.id
+                # Link to booking type if creating
+                if vals.get("type_id"):
+                    links.add((vals["type_id"], combination.id))
+        self._link_type_combinations(links)
+
+        with double_booking_guard():
+            bookings = super().create(vals_list)
+            if is_double_booking_prevented(self.env):
+                bookings.flush_recordset(SCHEDULING_FIELDS)
         return bookings
 
     def write(self, vals):
-        """Ensure combination is updated from room/provider on write"""
+        """Write the bookings in groups sharing their new combination"""
+        with double_booking_guard():
+            for bookings, booking_vals in self._partition_write(vals):
+                super(ResourceBooking, bookings).write(booking_vals)
+            if is_double_booking_prevented(self.env):
+                self.flush_recordset(SCHEDULING_FIELDS)
+        return True
+
+    def _partition_write(self, vals):
+        """Split a write into ``(bookings, vals)`` groups.
+
+        When the room or provider changes, each booking gets the combination
+        of its own new room and provider. Bookings ending up with the same
+        combination are written together.
+        """
+        combinations = {}
         if "room_id" in vals or "provider_id" in vals:
-            for booking in self:
-                room = (
-                    self.env["vet.room"].browse(vals["room_id"])
-                    if "room_id" in vals
-                    else booking.room_id
-                )
-                provider = (
-                    self.env["res.users"].browse(vals["provider_id"])
-                    if "provider_id" in vals
-                    else booking.provider_id
+            pairs = {
+                booking: (
+                    vals.get("room_id", booking.room_id.id),
+                    vals.get("provider_id", booking.provider_id.id),
                 )
-                combination = self._get_or_create_combination(room, provider)
-                if combination:
-                    vals["combination_id"] = combination.id
-                    # Link to booking type if not already linked
-                    if booking.type_id and not self.env[
-                        "resource.booking.type.combination.rel"
-                    ].search(
-                        [
-                            ("type_id", "=", booking.type_id.id),
-                            ("combination_id", "=", combination.id),
-                        ]
-                    ):
-                        self.env["resource.booking.type.combination.rel"].create(
-                            {
-                                "type_id": booking.type_id.id,
-                                "combination_id": combination.id,
-                                "sequence": 10,
-                            }
-                        )
-
-        result = super().write(vals)
-
-        # Regenerate name if key fields changed
-        if any(key in vals for key in ["patient_id", "type_id", "start"]):
-            for booking in self:
-                booking.name = booking._generate_name()
-
-        return result
-
-    @api.depends("patient_id", "owner_id", "type_id", "start")
-    def _compute_display_name(self):
-        """Override display name to show patient and owner"""
-        res = super()._compute_display_name()
+                for booking in self
+            }
+            by_pair = self._get_or_create_combinations(pairs.values())
+            combinations = {
+                booking: by_pair[pair]
+                for booking, pair in pairs.items()
+                if pair in by_pair
+            }
+            # Link to booking type if not already linked
+            links = set()
+            for booking, combination in combinations.items():
+                type_id = vals.get("type_id", booking.type_id.id)
+                if type_id:
+                    links.add((type_id, combination.id))
+            self._link_type_combinations(links)
+        if not combinations:
+            return [(self, vals)]
+        groups = defaultdict(list)
         for booking in self:
-            if booking.patient_id and booking.owner_id:
-                booking.display_name = (
-                    f"{booking.patient_id.name} - {booking.owner_id.name}"
-                )
-        return res
-
-    def _generate_name(self):
-        """Auto-generate a meaningful name for the booking"""
-        self.ensure_one()
-        parts = []
-
-        if self.patient_id:
-            parts.append(self.patient_id.name)
+            groups[combinations.get(booking)].append(booking.id)
+        partitions = []
+        for combination, booking_ids in groups.items():
+            booking_vals = dict(vals)
+            if combination:
+                booking_vals["combination_id"] = combination.id
+            partitions.append((self.browse(booking_ids), booking_vals))
+        return partitions
+
+    def unlink(self):
+        records = self.medical_record_id
+        result = super().unlink()
+        records._unlink_orphans()
+        return result
 
-        if self.type_id:
-            parts.append(self.type_id.name)
+    def init(self):
+        super().init()
+        # Patient timeline pages
+        create_index(
+            self.env.cr,
+            f"{self._table}_patient_id_start_idx",
+            self._table,
+            ["patient_id", "start"],
+            where="patient_id IS NOT NULL",
+        )
+        self._update_double_booking_constraints()
+
+    def _get_double_booking_constraints(self):
+        """Exclusion constraints enforced when double bookings are prevented"""
+        return [
+            (
+                f"{self._table}_{fname}_no_double_booking",
+                (
+                    f"EXCLUDE USING gist ({fname} WITH =, "
+                    "tsrange(start, stop) WITH &&) "
+                    f"WHERE ({fname} IS NOT NULL AND start IS NOT NULL "
+                    "AND stop IS NOT NULL AND active AND state != 'canceled') "
+                    "DEFERRABLE INITIALLY IMMEDIATE"
+                ),
+            )
+            for fname in ("provider_id", "room_id")
+        ]
+
+    def _update_double_booking_constraints(self, raise_if_failed=False):
+        """Add or drop the exclusion constraints to match the settings"""
+        update_exclusion_constraints(
+            self.env.cr,
+            self._table,
+            self._get_double_booking_constraints(),
+            is_double_booking_prevented(self.env),
+            raise_if_failed,
+        )
 
-        if self.start:
-            # Format: YYYY-MM-DD HH:MM
-            parts.append(self.start.strftime("%Y-%m-%d %H:%M"))
+    @api.depends("patient_id", "type_id", "start")
+    def _compute_name(self):
+        # Renaming a patient or type keeps past and hand-typed names
+        for booking in self:
+            booking.name = _booking_name(
+                booking.patient_id, booking.type_id, booking.start
+            )
 
-        return " - ".join(parts) if parts else "Appointment"
+    @api.depends("name", "patient_id")
+    def _compute_display_name(self):
+        """Show the booking name for the bookings of a patient"""
+        patient_bookings = self.filtered("patient_id")
+        super(ResourceBooking, self - patient_bookings)._compute_display_name()
+        for booking in patient_bookings:
+            booking.display_name = booking.name
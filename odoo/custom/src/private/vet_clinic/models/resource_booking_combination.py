@@ -0,0 +1,73 @@
+from odoo import Command, api, fields, models
+
+
+def _resource_key(resource_ids):
+    """Return the canonical key of a set of resource ids"""
+    return ",".join(str(res_id) for res_id in sorted(set(resource_ids))) or False
+
+
+class ResourceBookingCombination(models.Model):
+    _inherit = "resource.booking.combination"
+
+    resource_key = fields.Char(
+        compute="_compute_resource_key",
+        store=True,
+        precompute=True,
+        readonly=True,
+        copy=False,
+        help="Sorted ids of the resources, identifying the combination",
+    )
+
+    _sql_constraints = [
+        (
+            "resource_key_unique",
+            "unique(resource_key)",
+            "A combination with the same resources already exists!",
+        )
+    ]
+
+    @api.depends("resource_ids")
+    def _compute_resource_key(self):
+        for combination in self:
+            combination.resource_key = _resource_key(combination.resource_ids.ids)
+
+    @api.model
+    def _find_by_resources(self, resources):
+        """Return the combination of exactly ``resources``, archived or not"""
+        key = _resource_key(resources.ids)
+        if not key:
+            return self.browse()
+        return self.with_context(active_test=False).search(
+            [("resource_key", "=", key)], limit=1
+        )
+
+    @api.model
+    def _get_or_create_by_resources(self, resource_sets):
+        """Return the combinations of several resource sets, by resource key.
+
+        The existing combinations are found with one search and the missing
+        ones are created in one batch.
+        """
+        resources_by_key = {
+            _resource_key(resources.ids): resources
+            for resources in resource_sets
+            if resources
+        }
+        if not resources_by_key:
+            return {}
+        combinations = {
+            combination.resource_key: combination
+            for combination in self.with_context(active_test=False).search(
+                [("resource_key", "in", list(resources_by_key))]
+            )
+        }
+        missing = [key for key in resources_by_key if key not in combinations]
+        if missing:
+            created = self.create(
+                [
+                    {"resource_ids": [Command.set(resources_by_key[key].ids)]}
+                    for key in missing
+                ]
+            )
+            combinations.update(zip(missing, created, strict=True))
+        return combinations
@@ -1,11 +1,115 @@
+import math
+from collections import defaultdict
+from datetime import timedelta
+
+import pytz
+from markupsafe import Markup
+
 from odoo import _, api, fields, models
 from odoo.exceptions import ValidationError
+from odoo.tools import groupby
+from odoo.tools.sql import SQL, create_index
+
+from ..utils import (
+    deferred_constraints,
+    double_booking_guard,
+    ensure_extension,
+    is_double_booking_prevented,
+    update_exclusion_constraints,
+)
+
+APPOINTMENT_TYPES = [
+    ("checkup", "Regular Checkup"),
+    ("vaccination", "Vaccination"),
+    ("surgery", "Surgery"),
+    ("emergency", "Emergency"),
+    ("followup", "Follow-up"),
+    ("other", "Other"),
+]
+# Appointments in these states never block a provider or a room
+OVERLAP_IGNORED_STATES = ("done", "cancelled")
+# Fields that decide whether two appointments conflict
+OVERLAP_FIELDS = {"appointment_date", "duration", "provider_id", "room_id", "state"}
+# SQL predicate matching the appointments that can conflict
+ACTIVE_STATES_CLAUSE = "state NOT IN ({})".format(
+    ", ".join(f"'{state}'" for state in OVERLAP_IGNORED_STATES)
+)
+
+
+def _merge_intervals(intervals):
+    """Merge ``(start, stop)`` intervals into sorted, disjoint ones"""
+    merged = []
+    for start, stop in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], stop))
+        else:
+            merged.append((start, stop))
+    return merged
+
+
+def _to_local(moment, tz):
+    """Convert a naive UTC datetime to a naive datetime in ``tz``"""
+    return pytz.utc.localize(moment).astimezone(tz).replace(tzinfo=None)
+
+
+def _to_utc(moment, tz):
+    """Convert a naive datetime in ``tz`` to a naive UTC datetime"""
+    return tz.localize(moment).astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def _align(moment, step, tz=pytz.utc):
+    """Round ``moment`` up to the next ``step`` boundary of its day in ``tz``"""
+    local = _to_local(moment, tz)
+    midnight = local.replace(hour=0, minute=0, second=0, microsecond=0)
+    return _to_utc(midnight + math.ceil((local - midnight) / step) * step, tz)
+
+
+def _find_pool_slots(pools, start, stop, duration, step, limit, tz=pytz.utc):
+    """Sweep the busy intervals of resource pools for free slots.
+
+    ``pools`` maps a pool name to a ``{resource_id: busy}`` dict, ``busy``
+    being sorted, disjoint ``(start, stop)`` intervals. A slot is free when
+    every pool has a resource free for the whole ``duration``; the first such
+    resource of each pool is reported under the pool name. Slot starts lie on
+    a ``step`` grid of the local day in ``tz`` and the sweep only moves
+    forward, so each busy interval is visited once.
+    """
+    if not pools or not all(pools.values()):
+        return []
+    positions = defaultdict(int)
+    slots = []
+    moment = _align(start, step, tz)
+    while len(slots) < limit and moment + duration <= stop:
+        slot_stop = moment + duration
+        slot = {}
+        for pool, resources in pools.items():
+            release = None
+            for res_id, busy in resources.items():
+                index = positions[pool, res_id]
+                while index < len(busy) and busy[index][1] <= moment:
+                    index += 1
+                positions[pool, res_id] = index
+                if index == len(busy) or busy[index][0] >= slot_stop:
+                    slot[pool] = res_id
+                    break
+                if release is None or busy[index][1] < release:
+                    release = busy[index][1]
+            if pool not in slot:
+                break
+        if len(slot) == len(pools):
+            slots.append({"start": moment, "stop": slot_stop, **slot})
+            moment += step
+        else:
+            # No resource of the pool frees up before its earliest release
+            moment = _align(release, step, tz)
+    return slots
 
 
 class VetAppointment(models.Model):
     _name = "vet.appointment"
     _description = "Veterinary Appointment"
-    _inherit = ["mail.thread", "mail.activity.mixin"]
+    _inherit = ["vet.bulk.mixin", "mail.thread", "mail.activity.mixin"]
+    _inherits = {"vet.medical.record": "medical_record_id"}
     _order = "appointment_date desc"
 
     name = fields.Char(
@@ -30,16 +134,16 @@ class VetAppointment(models.Model):
 
     appointment_date = fields.Datetime(required=True, tracking=True)
     duration = fields.Float(string="Duration (hours)", default=0.5)
+    appointment_end = fields.Datetime(
+        string="End",
+        compute="_compute_appointment_end",
+        store=True,
+        precompute=True,
+        help="Stored end time, used by the overlap and availability queries",
+    )
 
     appointment_type = fields.Selection(
-        [
-            ("checkup", "Regular Checkup"),
-            ("vaccination", "Vaccination"),
-            ("surgery", "Surgery"),
-            ("emergency", "Emergency"),
-            ("followup", "Follow-up"),
-            ("other", "Other"),
-        ],
+        APPOINTMENT_TYPES,
         default="checkup",
         required=True,
         tracking=True,
@@ -53,6 +157,13 @@ class VetAppointment(models.Model):
         help="The staff member providing the service",
     )
     room_id = fields.Many2one("vet.room", string="Room", tracking=True)
+    series_id = fields.Many2one(
+        "vet.appointment.series",
+        string="Recurring Series",
+        index="btree_not_null",
+        ondelete="set null",
+        copy=False,
+    )
 
     state = fields.Selection(
         [
@@ -68,12 +179,24 @@ class VetAppointment(models.Model):
         tracking=True,
     )
 
-    reason = fields.Text(string="Reason for Visit", required=True)
-    diagnosis = fields.Text()
-    treatment = fields.Text()
-    prescription = fields.Text()
-
-    notes = fields.Text(string="Additional Notes")
+    # Clinical text lives in vet.medical.record, read only when displayed
+    medical_record_id = fields.Many2one(
+        "vet.medical.record",
+        string="Medical Record",
+        required=True,
+        ondelete="restrict",
+        auto_join=True,
+        index=True,
+    )
+    reason = fields.Text(
+        related="medical_record_id.reason",
+        inherited=True,
+        readonly=False,
+        required=True,
+    )
+    weight_ids = fields.One2many(
+        "vet.weight.measurement", "appointment_id", string="Weight Measurements"
+    )
 
     has_overlap = fields.Boolean(
         compute="_compute_has_overlap",
@@ -99,81 +222,350 @@ class VetAppointment(models.Model):
 
     @api.model_create_multi
     def create(self, vals_list):
-        for vals in vals_list:
-            if vals.get("name", _("New")) == _("New"):
-                vals["name"] = self.env["ir.sequence"].next_by_code(
-                    "vet.appointment"
-                ) or _("New")
-        return super().create(vals_list)
-
-    def _get_overlapping_appointments(self):
-        """Helper method to find overlapping appointments.
-        Returns tuple of (provider_overlaps, room_overlaps)
-        """
-        from datetime import timedelta
-
-        self.ensure_one()
-
-        if (
-            not self.appointment_date
-            or not self.duration
-            or not (self.provider_id or self.room_id)
+        new_vals_list = [
+            vals for vals in vals_list if vals.get("name", _("New")) == _("New")
+        ]
+        names = self.env["ir.sequence"].next_block_by_code(
+            "vet.appointment", len(new_vals_list)
+        )
+        for vals, name in zip(new_vals_list, names, strict=True):
+            vals["name"] = name or _("New")
+        with double_booking_guard():
+            appointments = super().create(vals_list)
+            appointments._recompute_overlap_neighbors()
+        return appointments
+
+    def write(self, vals):
+        if OVERLAP_FIELDS.isdisjoint(vals) or self.env.context.get(
+            "vet_defer_overlap_neighbors"
         ):
-            return [], []
+            return super().write(vals)
+        old_neighbors = self._get_overlap_neighbors()
+        with double_booking_guard():
+            result = super().write(vals)
+            self._recompute_overlap_neighbors(old_neighbors)
+        return result
+
+    def unlink(self):
+        neighbors = self._get_overlap_neighbors()
+        records = self.medical_record_id
+        result = super().unlink()
+        self.env.add_to_compute(self._fields["has_overlap"], neighbors)
+        records._unlink_orphans()
+        return result
+
+    @api.constrains("medical_record_id", "reason")
+    def _check_reason(self):
+        for appointment in self:
+            if not appointment.reason:
+                raise ValidationError(_("The reason for visit is required."))
 
-        # Calculate end time
-        start_time = self.appointment_date
-        end_time = start_time + timedelta(hours=self.duration)
+    def init(self):
+        """Index the busy period of active appointments per provider and room.
 
-        # Build domain to find overlapping appointments
-        domain = [
-            ("state", "not in", ["cancelled", "done"]),
-            ("appointment_date", "<", end_time),
+        With btree_gist the provider/room id and the period share one GiST
+        index; otherwise a GiST index on the period alone is used.
+        """
+        has_btree_gist = ensure_extension(self.env.cr, "btree_gist")
+        for fname in ("provider_id", "room_id"):
+            expressions = ["tsrange(appointment_date, appointment_end)"]
+            if has_btree_gist:
+                expressions.insert(0, fname)
+            create_index(
+                self.env.cr,
+                f"{self._table}_{fname}_period_idx",
+                self._table,
+                expressions,
+                method="gist",
+                where=f"{fname} IS NOT NULL AND {ACTIVE_STATES_CLAUSE}",
+            )
+        # Patient timeline pages
+        create_index(
+            self.env.cr,
+            f"{self._table}_patient_id_appointment_date_idx",
+            self._table,
+            ["patient_id", "appointment_date"],
+        )
+        self._update_double_booking_constraints()
+
+    def _get_double_booking_constraints(self):
+        """Exclusion constraints enforced when double bookings are prevented"""
+        return [
+            (
+                f"{self._table}_{fname}_no_double_booking",
+                (
+                    f"EXCLUDE USING gist ({fname} WITH =, "
+                    "tsrange(appointment_date, appointment_end) WITH &&) "
+                    f"WHERE ({fname} IS NOT NULL AND appointment_end IS NOT NULL "
+                    f"AND {ACTIVE_STATES_CLAUSE}) "
+                    # Deferred while a block of appointments is shifted
+                    "DEFERRABLE INITIALLY IMMEDIATE"
+                ),
+            )
+            for fname in ("provider_id", "room_id")
         ]
 
-        # Exclude current appointment if it has a real ID (not a new record)
-        if self.id and isinstance(self.id, int):
-            domain.append(("id", "!=", self.id))
-
-        # Search for overlaps
-        overlapping = self.env["vet.appointment"].search(domain)
-
-        provider_overlaps = []
-        room_overlaps = []
-
-        for other in overlapping:
-            other_end_time = other.appointment_date + timedelta(hours=other.duration)
+    def _update_double_booking_constraints(self, raise_if_failed=False):
+        """Add or drop the exclusion constraints to match the settings"""
+        update_exclusion_constraints(
+            self.env.cr,
+            self._table,
+            self._get_double_booking_constraints(),
+            is_double_booking_prevented(self.env),
+            raise_if_failed,
+        )
+
+    @api.depends("appointment_date", "duration")
+    def _compute_appointment_end(self):
+        for appointment in self:
+            if appointment.appointment_date:
+                # A negative duration would make an invalid range
+                appointment.appointment_end = appointment.appointment_date + timedelta(
+                    hours=max(appointment.duration, 0.0)
+                )
+            else:
+                appointment.appointment_end = False
 
-            # Check if times actually overlap
-            if other_end_time > start_time:
-                # Check provider overlap
-                if self.provider_id and other.provider_id == self.provider_id:
-                    provider_overlaps.append(other)
+    def _get_overlap_map(self):
+        """Find the conflicting appointments of every record in ``self``.
 
-                # Check room overlap
-                if self.room_id and other.room_id == self.room_id:
-                    room_overlaps.append(other)
+        All records are checked against the schedule with a single self-join,
+        using their current (possibly unsaved) values. Returns a dict mapping
+        each record to a ``(provider_overlaps, room_overlaps)`` pair.
+        """
+        Appointment = self.env["vet.appointment"]
+        overlaps = {appointment: (Appointment, Appointment) for appointment in self}
+        candidates = [
+            appointment
+            for appointment in self
+            if appointment.appointment_date
+            and appointment.duration > 0
+            and (appointment.provider_id or appointment.room_id)
+        ]
+        if not candidates:
+            return overlaps
+
+        # The query reads the other appointments straight from the table
+        Appointment.flush_model(
+            ["appointment_date", "appointment_end", "provider_id", "room_id", "state"]
+        )
+        values = SQL(", ").join(
+            SQL(
+                "(%s, %s, %s::int, %s::int, tsrange(%s, %s))",
+                index,
+                appointment._origin.id or 0,
+                appointment.provider_id.id or None,
+                appointment.room_id.id or None,
+                appointment.appointment_date,
+                appointment.appointment_date + timedelta(hours=appointment.duration),
+            )
+            for index, appointment in enumerate(candidates)
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                WITH candidate (idx, id, provider_id, room_id, period) AS (
+                    VALUES %s
+                )
+                SELECT c.idx,
+                       a.id,
+                       a.provider_id = c.provider_id,
+                       a.room_id = c.room_id
+                  FROM candidate c
+                  JOIN vet_appointment a
+                    ON a.id != c.id
+                   AND (a.provider_id = c.provider_id OR a.room_id = c.room_id)
+                   AND tsrange(a.appointment_date, a.appointment_end) && c.period
+                 WHERE a.state NOT IN %s
+              ORDER BY c.idx, a.appointment_date, a.id
+                """,
+                values,
+                OVERLAP_IGNORED_STATES,
+            )
+        )
+        provider_ids = defaultdict(list)
+        room_ids = defaultdict(list)
+        for index, other_id, same_provider, same_room in self.env.cr.fetchall():
+            if same_provider:
+                provider_ids[index].append(other_id)
+            if same_room:
+                room_ids[index].append(other_id)
+
+        for index, appointment in enumerate(candidates):
+            overlaps[appointment] = (
+                Appointment.browse(provider_ids[index]),
+                Appointment.browse(room_ids[index]),
+            )
+        return overlaps
+
+    @api.model
+    def _get_schedule_conflicts(self, plan):
+        """Check a rescheduling plan against itself and the rest of the schedule.
+
+        ``plan`` maps appointments to their new ``(start, stop, provider_id,
+        room_id)``; they are checked as if they were already moved, with a
+        single query. Returns the ``(appointment_id, conflicting_id)`` pairs;
+        a conflict between two moved appointments is reported once.
+        """
+        if not plan:
+            return []
+        self.flush_model(
+            ["appointment_date", "appointment_end", "provider_id", "room_id", "state"]
+        )
+        values = SQL(", ").join(
+            SQL(
+                "(%s, %s::int, %s::int, tsrange(%s, %s))",
+                appointment.id,
+                provider_id or None,
+                room_id or None,
+                start,
+                stop,
+            )
+            for appointment, (start, stop, provider_id, room_id) in plan.items()
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                WITH moved (id, provider_id, room_id, period) AS (
+                    VALUES %s
+                ),
+                schedule AS (
+                    SELECT id,
+                           provider_id,
+                           room_id,
+                           tsrange(appointment_date, appointment_end) AS period
+                      FROM vet_appointment
+                     WHERE %s
+                       AND id NOT IN (SELECT id FROM moved)
+                 UNION ALL
+                    SELECT id, provider_id, room_id, period
+                      FROM moved
+                )
+                SELECT m.id, s.id
+                  FROM moved m
+                  JOIN schedule s
+                    ON s.id != m.id
+                   AND (s.provider_id = m.provider_id OR s.room_id = m.room_id)
+                   AND s.period && m.period
+                   AND (s.id > m.id OR s.id NOT IN (SELECT id FROM moved))
+              ORDER BY m.id, s.id
+                """,
+                values,
+                SQL(ACTIVE_STATES_CLAUSE),
+            )
+        )
+        return self.env.cr.fetchall()
+
+    def _get_overlap_neighbors(self):
+        """Return the other appointments currently conflicting with ``self``"""
+        neighbor_ids = set()
+        for provider_overlaps, room_overlaps in self._get_overlap_map().values():
+            neighbor_ids.update(provider_overlaps.ids)
+            neighbor_ids.update(room_overlaps.ids)
+        return self.browse(neighbor_ids) - self
+
+    def _recompute_overlap_neighbors(self, old_neighbors=None):
+        """Schedule has_overlap recomputation for the appointments whose
+        conflict status may have changed because of ``self``: the ones it
+        conflicted with before the change and the ones it conflicts with now.
+        """
+        neighbors = self._get_overlap_neighbors()
+        if old_neighbors:
+            neighbors |= old_neighbors - self
+        if neighbors:
+            self.env.add_to_compute(self._fields["has_overlap"], neighbors)
+
+    @api.model
+    def _write_batches(self, batches, shifts=None):
+        """Apply ``(appointments, vals)`` writes and date shifts as one change.
+
+        ``shifts`` maps appointments to the time added to their date, see
+        _shift_dates(). The double booking constraints are checked once
+        everything is written, so that a block of appointments can move onto
+        its own slots. The neighbors are collected before the first write and
+        their conflict flag is recomputed once after the last one.
+        """
+        shifts = shifts or {}
+        appointments = self.browse().union(
+            *(records for records, _vals in batches), *shifts
+        )
+        old_neighbors = appointments._get_overlap_neighbors()
+        constraints = [
+            name for name, _definition in self._get_double_booking_constraints()
+        ]
+        with double_booking_guard():
+            with deferred_constraints(self.env.cr, self._table, constraints):
+                for records, vals in batches:
+                    records.with_context(vet_defer_overlap_neighbors=True).write(vals)
+                if shifts:
+                    self._shift_dates(shifts)
+                appointments.flush_recordset()
+            appointments._recompute_overlap_neighbors(old_neighbors)
+
+    @api.model
+    def _shift_dates(self, shifts):
+        """Move appointments by their timedelta in ``shifts`` with one query.
+
+        The query bypasses the ORM, so access rights, constraints and the
+        chatter are handled here: one note is logged per distinct shift.
+        """
+        appointments = self.browse().union(*shifts)
+        appointments.check_access_rights("write")
+        appointments.check_access_rule("write")
+        appointments.flush_recordset(["appointment_date", "appointment_end"])
+        self.env.cr.execute(
+            SQL(
+                """
+                UPDATE vet_appointment
+                   SET appointment_date = appointment_date + shift.delta,
+                       appointment_end = appointment_end + shift.delta,
+                       write_uid = %s,
+                       write_date = NOW() AT TIME ZONE 'UTC'
+                  FROM unnest(%s::int[], %s::interval[]) AS shift(id, delta)
+                 WHERE vet_appointment.id = shift.id
+                """,
+                self.env.uid,
+                [appointment.id for appointment in shifts],
+                list(shifts.values()),
+            )
+        )
+        appointments.invalidate_recordset(
+            ["appointment_date", "appointment_end", "write_uid", "write_date"]
+        )
+        # Recompute what depends on the schedule, e.g. has_overlap
+        appointments.modified(["appointment_date", "appointment_end"])
+        appointments._validate_fields(["appointment_date"])
+        if self._get_bulk_mode() == "silent":
+            return
+        label = self._fields["appointment_date"].get_description(self.env)["string"]
+        for delta, moved in groupby(shifts, key=shifts.get):
+            sign = "-" if delta < timedelta() else "+"
+            change = Markup("<li>%s: %s%s</li>") % (label, sign, abs(delta))
+            self.browse().union(*moved)._log_bulk_note(
+                _("Rescheduled %s appointments", len(moved)), change
+            )
 
-        return provider_overlaps, room_overlaps
+    def _get_overlapping_appointments(self):
+        """Helper method to find overlapping appointments.
+        Returns tuple of (provider_overlaps, room_overlaps)
+        """
+        self.ensure_one()
+        return self._get_overlap_map()[self]
 
     @api.depends("appointment_date", "duration", "provider_id", "room_id", "state")
     def _compute_has_overlap(self):
         """Check for overlapping appointments with the same provider or room"""
+        overlaps = self._get_overlap_map()
         for appointment in self:
-            (
-                provider_overlaps,
-                room_overlaps,
-            ) = appointment._get_overlapping_appointments()
+            provider_overlaps, room_overlaps = overlaps[appointment]
             appointment.has_overlap = bool(provider_overlaps or room_overlaps)
 
     @api.depends("appointment_date", "duration", "provider_id", "room_id", "state")
     def _compute_overlap_warning(self):
         """Build warning message for overlapping appointments"""
+        overlaps = self._get_overlap_map()
         for appointment in self:
-            (
-                provider_overlaps,
-                room_overlaps,
-            ) = appointment._get_overlapping_appointments()
+            provider_overlaps, room_overlaps = overlaps[appointment]
 
             if provider_overlaps or room_overlaps:
                 warnings = []
@@ -201,6 +593,169 @@ class VetAppointment(models.Model):
             else:
                 appointment.overlap_warning = False
 
+    @api.model
+    def find_free_slots(
+        self,
+        date_from,
+        date_to,
+        duration=None,
+        appointment_type="checkup",
+        provider_ids=None,
+        room_ids=None,
+        limit=20,
+    ):
+        """Return the first free slots between ``date_from`` and ``date_to``.
+
+        A slot needs one free provider among ``provider_ids`` and one free room
+        among ``room_ids`` within their working hours; when neither is given,
+        any provider will do. ``duration`` (in hours) and the slot grid default
+        to the booking type of ``appointment_type``; the grid follows the
+        clinic timezone. Returns a list of dicts with ``start``, ``stop``,
+        ``provider_id`` and ``room_id``.
+        """
+        type_duration, slot_duration = self._get_type_slot_settings(appointment_type)
+        duration = timedelta(hours=duration or type_duration)
+        step = timedelta(hours=slot_duration)
+        date_from = max(fields.Datetime.to_datetime(date_from), fields.Datetime.now())
+        date_to = fields.Datetime.to_datetime(date_to)
+        if date_from >= date_to:
+            return []
+
+        providers = self.env["res.users"].browse(provider_ids or [])
+        rooms = self.env["vet.room"].browse(room_ids or [])
+        if not providers and not rooms:
+            providers = self.env["res.users"].search([("is_provider", "=", True)])
+
+        pools = {}
+        if providers:
+            pools["provider_id"] = self._get_busy_intervals(
+                "provider_id", providers, "provider_resource_id", date_from, date_to
+            )
+        if rooms:
+            pools["room_id"] = self._get_busy_intervals(
+                "room_id", rooms, "resource_id", date_from, date_to
+            )
+        slots = _find_pool_slots(
+            pools, date_from, date_to, duration, step, limit, self._get_timezone()
+        )
+        return [{"provider_id": False, "room_id": False, **slot} for slot in slots]
+
+    @api.model
+    def _get_timezone(self):
+        """Return the timezone of the clinic, or else of the user"""
+        return pytz.timezone(
+            self.env.company.resource_calendar_id.tz or self.env.user.tz or "UTC"
+        )
+
+    @api.model
+    def _get_type_slot_settings(self, appointment_type):
+        """Return the duration and slot grid, in hours, of an appointment type"""
+        booking_type = self.env.ref(
+            f"vet_clinic.booking_type_{appointment_type}", raise_if_not_found=False
+        )
+        if not booking_type:
+            return 0.5, 0.5
+        return (
+            booking_type.duration,
+            booking_type.slot_duration or booking_type.duration,
+        )
+
+    @api.model
+    def _get_busy_intervals(self, fname, records, resource_fname, start, stop):
+        """Return the merged busy intervals of providers or rooms.
+
+        Appointments and resource bookings of all ``records`` are fetched with
+        a single query, and the time outside the working hours of their linked
+        resource (in ``resource_fname``) counts as busy too.
+        """
+        self.flush_model(
+            ["appointment_date", "appointment_end", "provider_id", "room_id", "state"]
+        )
+        self.env["resource.booking"].flush_model(
+            ["start", "stop", "provider_id", "room_id", "state", "active"]
+        )
+        self.env.cr.execute(
+            SQL(
+                """
+                SELECT %(fname)s, appointment_date, appointment_end
+                  FROM vet_appointment
+                 WHERE %(fname)s IN %(ids)s
+                   AND %(active)s
+                   AND tsrange(appointment_date, appointment_end)
+                       && tsrange(%(start)s, %(stop)s)
+             UNION ALL
+                SELECT %(fname)s, start, stop
+                  FROM resource_booking
+                 WHERE %(fname)s IN %(ids)s
+                   AND active
+                   AND state != 'canceled'
+                   AND tsrange(start, stop) && tsrange(%(start)s, %(stop)s)
+              ORDER BY 2
+                """,
+                fname=SQL.identifier(fname),
+                ids=tuple(records.ids),
+                active=SQL(ACTIVE_STATES_CLAUSE),
+                start=start,
+                stop=stop,
+            )
+        )
+        busy = defaultdict(list)
+        for res_id, busy_start, busy_stop in self.env.cr.fetchall():
+            busy[res_id].append((busy_start, busy_stop))
+
+        off_hours = self._get_off_hours(
+            records.sudo().mapped(resource_fname), start, stop
+        )
+        return {
+            record.id: _merge_intervals(
+                busy[record.id] + off_hours[record.sudo()[resource_fname].id]
+            )
+            for record in records
+        }
+
+    @api.model
+    def _get_off_hours(self, resources, start, stop):
+        """Return the intervals outside working hours (or on leave) per resource.
+
+        Resources without a calendar follow the one of the company, and the
+        key ``False`` gives the hours of the company calendar alone. Without
+        any calendar, the whole period is off.
+        """
+        company_calendar = self.env.company.resource_calendar_id
+        off_hours = defaultdict(lambda: [(start, stop)])
+        start_utc, stop_utc = pytz.utc.localize(start), pytz.utc.localize(stop)
+        groups = dict(
+            groupby(
+                resources,
+                key=lambda resource: resource.calendar_id or company_calendar,
+            )
+        )
+        if company_calendar:
+            groups.setdefault(company_calendar, [])
+        for calendar, calendar_resources in groups.items():
+            if not calendar:
+                continue
+            calendar_resources = resources.browse([r.id for r in calendar_resources])
+            work = calendar._work_intervals_batch(
+                start_utc, stop_utc, resources=calendar_resources
+            )
+            resource_ids = calendar_resources.ids
+            if calendar == company_calendar:
+                resource_ids.append(False)
+            for resource_id in resource_ids:
+                gaps, cursor = [], start
+                for work_start, work_stop, _meta in work[resource_id]:
+                    work_start = work_start.astimezone(pytz.utc).replace(tzinfo=None)
+                    if work_start > cursor:
+                        gaps.append((cursor, work_start))
+                    cursor = max(
+                        cursor, work_stop.astimezone(pytz.utc).replace(tzinfo=None)
+                    )
+                if cursor < stop:
+                    gaps.append((cursor, stop))
+                off_hours[resource_id] = gaps
+        return off_hours
+
     @api.constrains("appointment_date")
     def _check_appointment_date(self):
         for appointment in self:
@@ -211,6 +766,17 @@ class VetAppointment(models.Model):
                 if appointment.state == "scheduled":
                     raise ValidationError(_("Appointment date cannot be in the past."))
 
+    def write_following(self, vals):
+        """Apply ``vals`` to this occurrence and the following ones of its series.
+
+        Returns the updated occurrences.
+        """
+        self.ensure_one()
+        if not self.series_id:
+            self.write(vals)
+            return self
+        return self.series_id._update_from(self, vals)
+
     def action_confirm(self):
         self.write({"state": "confirmed"})
 
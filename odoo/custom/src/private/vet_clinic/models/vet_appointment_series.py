@@ -0,0 +1,230 @@
+from datetime import datetime, time
+
+from dateutil import rrule
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError, ValidationError
+
+from .vet_appointment import (
+    APPOINTMENT_TYPES,
+    OVERLAP_IGNORED_STATES,
+    _to_local,
+    _to_utc,
+)
+
+RRULE_FREQUENCIES = {
+    "daily": rrule.DAILY,
+    "weekly": rrule.WEEKLY,
+    "monthly": rrule.MONTHLY,
+    "yearly": rrule.YEARLY,
+}
+# Safety net for open-ended "until" rules
+MAX_OCCURRENCES = 366
+# Fields copied from the series onto each occurrence
+OCCURRENCE_FIELDS = [
+    "patient_id",
+    "appointment_type",
+    "reason",
+    "provider_id",
+    "room_id",
+    "duration",
+]
+
+
+class VetAppointmentSeries(models.Model):
+    _name = "vet.appointment.series"
+    _description = "Recurring Appointment Series"
+    _inherit = ["mail.thread", "mail.activity.mixin"]
+    _order = "start desc"
+
+    name = fields.Char(compute="_compute_name", store=True)
+    patient_id = fields.Many2one(
+        "vet.patient", string="Patient", required=True, tracking=True
+    )
+    owner_id = fields.Many2one(
+        "vet.owner", string="Owner", related="patient_id.owner_id", store=True
+    )
+    appointment_type = fields.Selection(
+        APPOINTMENT_TYPES, default="checkup", required=True, tracking=True
+    )
+    reason = fields.Text(string="Reason for Visit", required=True)
+    provider_id = fields.Many2one(
+        "res.users",
+        string="Provider",
+        domain=[("is_provider", "=", True)],
+        tracking=True,
+    )
+    room_id = fields.Many2one("vet.room", string="Room", tracking=True)
+
+    start = fields.Datetime(string="First Appointment", required=True, tracking=True)
+    duration = fields.Float(string="Duration (hours)", default=0.5)
+    rule_type = fields.Selection(
+        [
+            ("daily", "Days"),
+            ("weekly", "Weeks"),
+            ("monthly", "Months"),
+            ("yearly", "Years"),
+        ],
+        string="Repeat Every",
+        default="weekly",
+        required=True,
+    )
+    interval = fields.Integer(default=1, required=True)
+    end_type = fields.Selection(
+        [
+            ("count", "Number of Appointments"),
+            ("until", "End Date"),
+        ],
+        string="Until",
+        default="count",
+        required=True,
+    )
+    count = fields.Integer(string="Repetitions", default=4)
+    until = fields.Date(string="End Date")
+
+    appointment_ids = fields.One2many(
+        "vet.appointment", "series_id", string="Appointments"
+    )
+    appointment_count = fields.Integer(
+        string="Number of Appointments", compute="_compute_appointment_stats"
+    )
+    overlap_count = fields.Integer(
+        string="Overlapping Appointments", compute="_compute_appointment_stats"
+    )
+    active = fields.Boolean(default=True)
+
+    _sql_constraints = [
+        ("interval_positive", "CHECK(interval > 0)", "The interval must be positive!")
+    ]
+
+    @api.depends("patient_id", "appointment_type")
+    def _compute_name(self):
+        types = dict(APPOINTMENT_TYPES)
+        for series in self:
+            series.name = " - ".join(
+                part
+                for part in (
+                    series.patient_id.name,
+                    types.get(series.appointment_type),
+                )
+                if part
+            )
+
+    @api.depends("appointment_ids.has_overlap")
+    def _compute_appointment_stats(self):
+        counts = {
+            (series.id, has_overlap): count
+            for series, has_overlap, count in self.env["vet.appointment"]._read_group(
+                [("series_id", "in", self.ids)],
+                ["series_id", "has_overlap"],
+                ["__count"],
+            )
+        }
+        for series in self:
+            overlap_count = counts.get((series.id, True), 0)
+            series.appointment_count = counts.get((series.id, False), 0) + overlap_count
+            series.overlap_count = overlap_count
+
+    @api.constrains("end_type", "count", "until")
+    def _check_end(self):
+        for series in self:
+            if series.end_type == "count" and not (0 < series.count <= MAX_OCCURRENCES):
+                raise ValidationError(
+                    _(
+                        "The number of appointments must be between 1 and %s.",
+                        MAX_OCCURRENCES,
+                    )
+                )
+            if series.end_type == "until" and not series.until:
+                raise ValidationError(_("Please set the end date of the series."))
+
+    def _get_occurrence_dates(self, start=None, count=None):
+        """Return the start datetimes of the occurrences of the series.
+
+        The rule is expanded in the clinic timezone, so that the occurrences
+        keep their local time across daylight saving time changes.
+        """
+        self.ensure_one()
+        tz = self.env["vet.appointment"]._get_timezone()
+        rule_vals = {
+            "dtstart": _to_local(start or self.start, tz),
+            "interval": self.interval,
+        }
+        if count or self.end_type == "count":
+            rule_vals["count"] = count or self.count
+        else:
+            rule_vals["until"] = datetime.combine(self.until, time.max)
+        rule = rrule.rrule(RRULE_FREQUENCIES[self.rule_type], **rule_vals)
+        return [_to_utc(moment, tz) for moment in rule[:MAX_OCCURRENCES]]
+
+    def _prepare_occurrence_vals(self, dates, extra_vals=None):
+        self.ensure_one()
+        series_vals = self._convert_to_write(
+            {fname: self[fname] for fname in OCCURRENCE_FIELDS}
+        )
+        return [
+            {
+                **series_vals,
+                **(extra_vals or {}),
+                "series_id": self.id,
+                "appointment_date": date,
+            }
+            for date in dates
+        ]
+
+    def _generate_appointments(self, start=None, count=None, extra_vals=None):
+        """Create the occurrences of the series in one batch"""
+        vals_list = []
+        for series in self:
+            vals_list += series._prepare_occurrence_vals(
+                series._get_occurrence_dates(start=start, count=count), extra_vals
+            )
+        return self.env["vet.appointment"].create(vals_list)
+
+    def action_generate_appointments(self):
+        if self.appointment_ids:
+            raise UserError(_("The appointments of this series were already created."))
+        self._generate_appointments()
+
+    def _update_from(self, occurrence, vals):
+        """Rewrite ``occurrence`` and the following open occurrences.
+
+        The appointments are kept: other changes are applied with one write,
+        and moving the appointment time moves every following occurrence by
+        the same local time, with a single query.
+        """
+        self.ensure_one()
+        following = self.appointment_ids.filtered(
+            lambda appointment: (
+                appointment.appointment_date >= occurrence.appointment_date
+                and appointment.state not in OVERLAP_IGNORED_STATES
+            )
+        )
+        if not following:
+            raise UserError(_("Only open appointments can be rescheduled."))
+        other_vals = {
+            fname: value for fname, value in vals.items() if fname != "appointment_date"
+        }
+        batches = [(following, other_vals)] if other_vals else []
+        shifts = None
+        if "appointment_date" in vals:
+            tz = self.env["vet.appointment"]._get_timezone()
+            delta = _to_local(
+                fields.Datetime.to_datetime(vals["appointment_date"]), tz
+            ) - _to_local(occurrence.appointment_date, tz)
+            shifts = {
+                appointment: _to_utc(
+                    _to_local(appointment.appointment_date, tz) + delta, tz
+                )
+                - appointment.appointment_date
+                for appointment in following
+            }
+            now = fields.Datetime.now()
+            if any(
+                appointment.appointment_date + shift < now
+                and appointment.state == "scheduled"
+                for appointment, shift in shifts.items()
+            ):
+                raise ValidationError(_("Appointment date cannot be in the past."))
+        self.env["vet.appointment"]._write_batches(batches, shifts=shifts)
+        return following
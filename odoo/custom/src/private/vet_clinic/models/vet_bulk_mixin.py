@@ -0,0 +1,72 @@
+from markupsafe import Markup
+
+from odoo import _, api, models
+
+# Context disabling the per-record chatter work of mail.thread
+BULK_CONTEXT = {
+    "tracking_disable": True,
+    "mail_create_nolog": True,
+    "mail_create_nosubscribe": True,
+    "mail_notrack": True,
+}
+# "summary" logs one note per write, on the first record, listing the others;
+# "silent" logs nothing at all
+BULK_MODES = ("summary", "silent")
+# Number of records named in a summary note, the others are only counted
+BULK_SUMMARY_NAMES = 20
+
+
+class VetBulkMixin(models.AbstractModel):
+    _name = "vet.bulk.mixin"
+    _description = "Bulk Operation Mode"
+
+    def _get_bulk_mode(self):
+        mode = self.env.context.get("vet_bulk_mode")
+        if mode is True:
+            return "summary"
+        return mode if mode in BULK_MODES else False
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        if not self._get_bulk_mode():
+            return super().create(vals_list)
+        records = super(VetBulkMixin, self.with_context(**BULK_CONTEXT)).create(
+            vals_list
+        )
+        return records.with_env(self.env)
+
+    def write(self, vals):
+        mode = self._get_bulk_mode()
+        if not mode:
+            return super().write(vals)
+        result = super(VetBulkMixin, self.with_context(**BULK_CONTEXT)).write(vals)
+        if mode == "summary":
+            self._log_bulk_summary(vals)
+        return result
+
+    def _log_bulk_summary(self, vals):
+        """Log a single note listing the updated records and their new values"""
+        tracked = self._track_get_fields()
+        fnames = [fname for fname in vals if fname in tracked]
+        if not self or not fnames:
+            return
+        record = self[0]
+        changes = Markup("").join(
+            Markup("<li>%s: %s</li>")
+            % (
+                self._fields[fname].get_description(self.env)["string"],
+                self._fields[fname].convert_to_export(record[fname], record) or "",
+            )
+            for fname in fnames
+        )
+        self._log_bulk_note(_("Bulk update of %s records", len(self)), changes)
+
+    def _log_bulk_note(self, title, changes):
+        """Log ``title`` and the ``changes`` list items on the first record,
+        naming at most BULK_SUMMARY_NAMES of the records
+        """
+        names = ", ".join(self[:BULK_SUMMARY_NAMES].mapped("display_name"))
+        if len(self) > BULK_SUMMARY_NAMES:
+            names = _("%s and %s more", names, len(self) - BULK_SUMMARY_NAMES)
+        body = Markup("%s<ul>%s</ul>%s") % (title, changes, names)
+        self[0]._message_log(body=body)
@@ -0,0 +1,122 @@
+import textwrap
+
+from odoo import api, fields, models
+from odoo.tools import html2plaintext
+from odoo.tools.sql import SQL, create_index
+
+# Text search configuration and fields of the full-text index
+FTS_CONFIG = "english"
+FTS_FIELDS = ["subjective", "objective", "assessment", "plan", "content"]
+
+
+FTS_INDEX_EXPRESSION = "to_tsvector('{}'::regconfig, {})".format(
+    FTS_CONFIG, " || ' ' || ".join(f"coalesce({fname}, '')" for fname in FTS_FIELDS)
+)
+
+
+def _fts_document(table):
+    """Return the text search document of the notes, matching the index"""
+    sections = SQL(" || ' ' || ").join(
+        SQL("coalesce(%s, '')", SQL.identifier(table, fname)) for fname in FTS_FIELDS
+    )
+    return SQL("to_tsvector(%s::regconfig, %s)", FTS_CONFIG, sections)
+
+
+class VetMedicalNote(models.Model):
+    _name = "vet.medical.note"
+    _description = "Medical Note"
+    _order = "date desc, id desc"
+    _rec_name = "summary"
+
+    patient_id = fields.Many2one(
+        "vet.patient", string="Patient", required=True, ondelete="cascade"
+    )
+    author_id = fields.Many2one(
+        "res.users", string="Author", required=True, default=lambda self: self.env.user
+    )
+    note_type = fields.Selection(
+        [
+            ("soap", "SOAP"),
+            ("communication", "Communication"),
+            ("internal", "Internal"),
+            ("report", "Report"),
+            ("result", "Result"),
+        ],
+        string="Type",
+        default="soap",
+        required=True,
+    )
+    date = fields.Datetime(required=True, default=fields.Datetime.now)
+
+    # SOAP sections
+    subjective = fields.Text()
+    objective = fields.Text()
+    assessment = fields.Text()
+    plan = fields.Text()
+    # Free-form body of the other note types
+    content = fields.Html()
+
+    summary = fields.Char(compute="_compute_summary", store=True)
+    is_important = fields.Boolean(string="Important")
+    is_private = fields.Boolean(
+        string="Private", help="Only visible to its author and the managers."
+    )
+    search_text = fields.Char(
+        string="Note Text",
+        compute="_compute_search_text",
+        search="_search_search_text",
+        help="Full-text search over the SOAP sections and the content",
+    )
+
+    def init(self):
+        create_index(
+            self.env.cr,
+            f"{self._table}_patient_id_date_idx",
+            self._table,
+            ["patient_id", "date"],
+        )
+        create_index(
+            self.env.cr,
+            f"{self._table}_important_idx",
+            self._table,
+            ["patient_id", "date"],
+            where="is_important",
+        )
+        create_index(
+            self.env.cr,
+            f"{self._table}_fts_idx",
+            self._table,
+            [FTS_INDEX_EXPRESSION],
+            method="gin",
+        )
+
+    @api.depends("assessment", "subjective", "content")
+    def _compute_summary(self):
+        for note in self:
+            text = (
+                note.assessment
+                or note.subjective
+                or html2plaintext(note.content or "").strip()
+            )
+            note.summary = (
+                textwrap.shorten(text.splitlines()[0], 120, placeholder="...")
+                if text
+                else False
+            )
+
+    def _compute_search_text(self):
+        self.search_text = False
+
+    def _search_search_text(self, operator, value):
+        if operator not in ("ilike", "=") or not value:
+            return []
+        query = self._search([])
+        query.add_where(
+            SQL(
+                "%s @@ websearch_to_tsquery(%s::regconfig, %s)",
+                _fts_document(self._table),
+                FTS_CONFIG,
+                value,
+            )
+        )
+        return [("id", "in", query)]
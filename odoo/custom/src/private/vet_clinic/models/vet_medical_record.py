@@ -0,0 +1,40 @@
+from odoo import fields, models
+
+# Clinical text fields, kept off the scheduling tables
+MEDICAL_RECORD_FIELDS = ["reason", "diagnosis", "treatment", "prescription", "notes"]
+
+
+class VetMedicalRecord(models.Model):
+    _name = "vet.medical.record"
+    _description = "Appointment Medical Record"
+
+    reason = fields.Text(
+        string="Reason for Visit",
+        help="Primary reason for the appointment",
+    )
+    diagnosis = fields.Text(
+        help="Diagnosis determined during the appointment",
+    )
+    treatment = fields.Text(
+        help="Treatment plan for the patient",
+    )
+    prescription = fields.Text(
+        help="Medications prescribed",
+    )
+    notes = fields.Text(
+        string="Additional Notes",
+        help="Any additional notes about the appointment",
+    )
+    appointment_ids = fields.One2many(
+        "vet.appointment", "medical_record_id", string="Appointments"
+    )
+    booking_ids = fields.One2many(
+        "resource.booking", "medical_record_id", string="Bookings"
+    )
+
+    def _unlink_orphans(self):
+        """Delete the records no longer linked to an appointment or booking"""
+        records = self.exists().sudo().with_context(active_test=False)
+        records.filtered(
+            lambda record: not record.appointment_ids and not record.booking_ids
+        ).unlink()
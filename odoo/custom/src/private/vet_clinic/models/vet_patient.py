@@ -1,10 +1,54 @@
-from odoo import api, fields, models
+import logging
+import operator
+import re
+from datetime import date, datetime, time
+
+from dateutil.relativedelta import relativedelta
+from markupsafe import Markup
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError, ValidationError
+from odoo.osv import expression
+from odoo.tools import groupby
+from odoo.tools.sql import SQL, escape_psql
+
+from ..utils import create_trigram_indexes, has_extension
+from .vet_appointment import OVERLAP_IGNORED_STATES
+from .vet_owner import SEARCH_FIELDS as OWNER_SEARCH_FIELDS
+
+_logger = logging.getLogger(__name__)
+
+# Fields searched by the front desk quick find, backed by trigram indexes
+SEARCH_FIELDS = ["name", "breed", "microchip_number"]
+# ISO 11784/11785 transponder codes: 3-digit country or manufacturer code
+# followed by a 12-digit national identification code
+MICROCHIP_PATTERN = re.compile(r"\d{15}")
+MICROCHIP_SEPARATORS = re.compile(r"[\s.\-]")
+IMAGE_VARIANTS = ["image_512", "image_256", "image_128"]
+# ir.config_parameter holding the last patient processed by the photo backfill
+IMAGE_BACKFILL_PARAM = "vet_clinic.image_backfill_last_id"
+# Comparisons supported by the age search
+AGE_OPERATORS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+# Entries per kind shown in the patient header
+CLINICAL_SUMMARY_LIMIT = 10
+AGE_GROUPS = [
+    ("juvenile", "Juvenile"),
+    ("adult", "Adult"),
+    ("senior", "Senior"),
+]
 
 
 class VetPatient(models.Model):
     _name = "vet.patient"
     _description = "Veterinary Patient"
-    _inherit = ["mail.thread", "mail.activity.mixin"]
+    _inherit = ["vet.bulk.mixin", "mail.thread", "mail.activity.mixin"]
     _order = "name"
 
     name = fields.Char(string="Patient Name", required=True, tracking=True)
@@ -37,6 +81,13 @@ class VetPatient(models.Model):
         ),
     )
     age = fields.Char(compute="_compute_age", store=False)
+    age_in_years = fields.Integer(
+        string="Age in Years", compute="_compute_age", search="_search_age_in_years"
+    )
+    # Refreshed daily by a cron, see _cron_refresh_age_group()
+    age_group = fields.Selection(
+        AGE_GROUPS, compute="_compute_age_group", store=True, index=True
+    )
 
     # Toggle for age vs birth date entry mode
     age_entry_mode = fields.Boolean(
@@ -49,7 +100,9 @@ class VetPatient(models.Model):
     age_months = fields.Integer(string="Age (Months)", default=0)
 
     color = fields.Char(string="Color/Markings")
-    microchip_number = fields.Char()
+    microchip_number = fields.Char(
+        copy=False, help="15-digit ISO 11784/11785 transponder code"
+    )
 
     # Weight stored internally in kg
     weight = fields.Float(string="Weight (kg)", tracking=True)
@@ -70,6 +123,16 @@ class VetPatient(models.Model):
         store=False,
     )
 
+    weight_ids = fields.One2many(
+        "vet.weight.measurement", "patient_id", string="Weight History"
+    )
+    note_ids = fields.One2many("vet.medical.note", "patient_id", string="Medical Notes")
+    problem_ids = fields.One2many("vet.problem", "patient_id", string="Problems")
+    clinical_summary = fields.Html(
+        compute="_compute_clinical_summary",
+        help="Active problems and important notes shown in the patient header",
+    )
+
     neutered = fields.Boolean(string="Spayed/Neutered", default=False, tracking=True)
 
     appointment_ids = fields.One2many(
@@ -82,27 +145,595 @@ class VetPatient(models.Model):
     allergies = fields.Text(string="Known Allergies")
     medical_notes = fields.Text()
 
-    image = fields.Binary(string="Photo", attachment=True)
+    image = fields.Image(string="Photo", max_width=1920, max_height=1920)
+    # Resized copies, generated on upload; use the smallest one that fits
+    image_512 = fields.Image(
+        string="Photo 512", related="image", max_width=512, max_height=512, store=True
+    )
+    image_256 = fields.Image(
+        string="Photo 256", related="image", max_width=256, max_height=256, store=True
+    )
+    image_128 = fields.Image(
+        string="Photo 128", related="image", max_width=128, max_height=128, store=True
+    )
 
     active = fields.Boolean(default=True)
 
+    _sql_constraints = [
+        (
+            "microchip_number_unique",
+            "unique(microchip_number)",
+            "This microchip number is already assigned to another patient!",
+        )
+    ]
+
+    @api.model
+    def _normalize_microchip(self, microchip_number):
+        """Strip the separators scanners and people put in microchip numbers"""
+        if not microchip_number:
+            return False
+        return MICROCHIP_SEPARATORS.sub("", microchip_number) or False
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        for vals in vals_list:
+            if "microchip_number" in vals:
+                vals["microchip_number"] = self._normalize_microchip(
+                    vals["microchip_number"]
+                )
+        patients = super().create(vals_list)
+        if not self.env.context.get("vet_weight_sync"):
+            patients.filtered("weight")._record_weight()
+        return patients
+
+    def write(self, vals):
+        if "microchip_number" in vals:
+            vals = dict(
+                vals,
+                microchip_number=self._normalize_microchip(vals["microchip_number"]),
+            )
+        result = super().write(vals)
+        if vals.get("weight") and not self.env.context.get("vet_weight_sync"):
+            self._record_weight()
+        return result
+
+    def _record_weight(self):
+        """Add the current weight of the patients to their weight history"""
+        self.env["vet.weight.measurement"].with_context(vet_weight_sync=True).create(
+            [{"patient_id": patient.id, "weight": patient.weight} for patient in self]
+        )
+
+    @api.constrains("microchip_number")
+    def _check_microchip_number(self):
+        for patient in self:
+            if patient.microchip_number and not MICROCHIP_PATTERN.fullmatch(
+                patient.microchip_number
+            ):
+                raise ValidationError(
+                    _("The microchip number must be made of 15 digits.")
+                )
+
+    @api.model
+    def microchip_lookup(self, microchip_number):
+        """Return what the front desk needs after scanning a microchip.
+
+        The patient, its owner and its next open appointment are read in one
+        call, without the image and chatter of the patient form. Returns False
+        when no patient carries this microchip.
+        """
+        microchip_number = self._normalize_microchip(microchip_number)
+        if not microchip_number:
+            return False
+        patient = self.with_context(active_test=False).search(
+            [("microchip_number", "=", microchip_number)], limit=1
+        )
+        if not patient:
+            return False
+        appointment = self.env["vet.appointment"].search(
+            [
+                ("patient_id", "=", patient.id),
+                ("appointment_date", ">=", fields.Datetime.now()),
+                ("state", "not in", OVERLAP_IGNORED_STATES),
+            ],
+            order="appointment_date",
+            limit=1,
+        )
+        [patient_vals] = patient.read(
+            [
+                "name",
+                "microchip_number",
+                "species_id",
+                "breed",
+                "gender",
+                "age",
+                "age_group",
+                "allergies",
+                "active",
+            ]
+        )
+        [owner_vals] = patient.owner_id.read(["name", "email", "phone", "mobile"])
+        appointment_vals = False
+        if appointment:
+            [appointment_vals] = appointment.read(
+                [
+                    "name",
+                    "appointment_date",
+                    "appointment_type",
+                    "provider_id",
+                    "room_id",
+                    "state",
+                ]
+            )
+        # bin_size only reads the photo size, not the full picture
+        has_image = patient.with_context(bin_size=True).image
+        patient_vals["image_url"] = (
+            f"/web/image/vet.patient/{patient.id}/image_128" if has_image else False
+        )
+        return {
+            "patient": patient_vals,
+            "owner": owner_vals,
+            "next_appointment": appointment_vals,
+        }
+
+    @api.model
+    def _cron_backfill_image_variants(self, batch_size=200):
+        """Generate the resized photos of patients uploaded before they existed.
+
+        Works through one batch per run and triggers itself again until every
+        photo has its variants, so large databases are processed in chunks.
+        Photos that cannot be resized are logged and skipped.
+        """
+        params = self.env["ir.config_parameter"].sudo()
+        last_id = int(params.get_param(IMAGE_BACKFILL_PARAM, 0))
+        self.env.cr.execute(
+            """
+            SELECT res_id
+              FROM ir_attachment
+             WHERE res_model = %(model)s
+               AND res_field = 'image'
+               AND res_id > %(last_id)s
+               AND NOT EXISTS (
+                       SELECT 1
+                         FROM ir_attachment variant
+                        WHERE variant.res_model = %(model)s
+                          AND variant.res_field = 'image_128'
+                          AND variant.res_id = ir_attachment.res_id
+                   )
+          ORDER BY res_id
+             LIMIT %(limit)s
+            """,
+            {"model": self._name, "last_id": last_id, "limit": batch_size + 1},
+        )
+        ids = [row[0] for row in self.env.cr.fetchall()]
+        patients = self.with_context(active_test=False).browse(ids[:batch_size])
+        variant_fields = [self._fields[fname] for fname in IMAGE_VARIANTS]
+        for patient in patients.exists():
+            try:
+                with self.env.cr.savepoint():
+                    for field in variant_fields:
+                        self.env.add_to_compute(field, patient)
+                    patient.flush_recordset(IMAGE_VARIANTS)
+            except Exception:
+                _logger.exception(
+                    "Could not resize the photo of patient %s", patient.id
+                )
+                for field in variant_fields:
+                    self.env.remove_to_compute(field, patient)
+                patient.invalidate_recordset(IMAGE_VARIANTS, flush=False)
+        if ids:
+            # Skipped photos are not picked up again by the next batches
+            params.set_param(IMAGE_BACKFILL_PARAM, ids[:batch_size][-1])
+        if len(ids) > batch_size:
+            self.env.ref("vet_clinic.ir_cron_backfill_patient_images")._trigger()
+
+    def init(self):
+        create_trigram_indexes(self.env.cr, self._table, SEARCH_FIELDS)
+
+    @api.model
+    def _get_timeline_sources(self):
+        """Return the records shown in the patient timeline.
+
+        Each source gives the model, its patient and date fields, and the
+        fields used as title and summary of the timeline entries. Override
+        to add sources.
+        """
+        return [
+            {
+                "model": "vet.appointment",
+                "patient": "patient_id",
+                "date": "appointment_date",
+                "title": "name",
+                "summary": "reason",
+            },
+            {
+                "model": "resource.booking",
+                "patient": "patient_id",
+                "date": "start",
+                "title": "name",
+                "summary": "reason",
+            },
+            {
+                "model": "vet.weight.measurement",
+                "patient": "patient_id",
+                "date": "date",
+                "title": "weight",
+                "summary": False,
+            },
+            {
+                "model": "vet.medical.note",
+                "patient": "patient_id",
+                "date": "date",
+                "title": "summary",
+                "summary": "note_type",
+            },
+            {
+                "model": "vet.problem",
+                "patient": "patient_id",
+                "date": "onset_date",
+                "title": "name",
+                "summary": "status",
+            },
+        ]
+
+    def _get_timeline_source_query(self, source, cursor, limit):
+        """Return the SQL of one source, restricted to the entries after cursor"""
+        Model = self.env[source["model"]]
+        domain = [(source["patient"], "=", self.id), (source["date"], "!=", False)]
+        if cursor:
+            cursor_date, cursor_model, cursor_id = cursor
+            fname = source["date"]
+            # Date fields are listed at midnight of their day
+            if Model._fields[fname].type == "date":
+                cursor_day = cursor_date.date()
+                if cursor_date != datetime.combine(cursor_day, time.min):
+                    cursor_model = None
+                cursor_date = cursor_day
+            # Entries are sorted on (date, model, id), all descending; models
+            # are compared bytewise, like the "C" collation of get_timeline()
+            if cursor_model is None or Model._name < cursor_model:
+                after = [(fname, "<=", cursor_date)]
+            elif Model._name > cursor_model:
+                after = [(fname, "<", cursor_date)]
+            else:
+                after = [
+                    "|",
+                    (fname, "<", cursor_date),
+                    "&",
+                    (fname, "=", cursor_date),
+                    ("id", "<", cursor_id),
+                ]
+            domain = expression.AND([domain, after])
+        query = Model._search(
+            domain, limit=limit, order=f"{source['date']} desc, id desc"
+        )
+        if query.is_empty():
+            return None
+
+        def column(fname):
+            if not fname:
+                return SQL("NULL::varchar")
+            if Model._fields[fname].inherited:
+                # Delegated fields, e.g. the reason, come from the parent table
+                return SQL(
+                    "%s::varchar",
+                    SQL(Model._inherits_join_calc(Model._table, fname, query)),
+                )
+            return SQL("%s::varchar", SQL.identifier(Model._table, fname))
+
+        return query.select(
+            SQL(
+                "%s::varchar AS model, %s AS id, %s::timestamp AS date, %s AS title, "
+                "%s AS summary",
+                Model._name,
+                SQL.identifier(Model._table, "id"),
+                SQL.identifier(Model._table, source["date"]),
+                column(source["title"]),
+                column(source["summary"]),
+            )
+        )
+
+    def get_timeline(self, cursor=None, limit=40):
+        """Return one page of the patient history, most recent first.
+
+        Appointments, bookings, weight measurements and any other source of
+        _get_timeline_sources() are merged with a single UNION query per
+        page. Pass the returned ``next_cursor`` to fetch the following page;
+        it is False on the last page.
+        """
+        self.ensure_one()
+        self.check_access_rights("read")
+        self.check_access_rule("read")
+        if cursor:
+            cursor_date, cursor_model, cursor_id = cursor.split(",")
+            cursor = (
+                fields.Datetime.to_datetime(cursor_date),
+                cursor_model,
+                int(cursor_id),
+            )
+        queries = []
+        for source in self._get_timeline_sources():
+            Model = self.env[source["model"]]
+            if not Model.check_access_rights("read", raise_exception=False):
+                continue
+            query = self._get_timeline_source_query(source, cursor, limit + 1)
+            if query is not None:
+                queries.append(SQL("(%s)", query))
+        if not queries:
+            return {"entries": [], "next_cursor": False}
+        self.env.cr.execute(
+            SQL(
+                '%s ORDER BY date DESC, model COLLATE "C" DESC, id DESC LIMIT %s',
+                SQL(" UNION ALL ").join(queries),
+                limit + 1,
+            )
+        )
+        entries = self.env.cr.dictfetchall()
+        next_cursor = False
+        if len(entries) > limit:
+            entries = entries[:limit]
+            last = entries[-1]
+            next_cursor = ",".join(
+                [
+                    fields.Datetime.to_string(last["date"]),
+                    last["model"],
+                    str(last["id"]),
+                ]
+            )
+        for entry in entries:
+            entry["date"] = fields.Datetime.to_string(entry["date"])
+        return {"entries": entries, "next_cursor": next_cursor}
+
+    def _get_clinical_summary(self):
+        """Return the active problems and important notes of the patient.
+
+        Both lists are read with one query, most recent first, problems
+        before notes.
+        """
+        self.ensure_one()
+        queries = []
+        for model_name, domain, title, date_fname in (
+            ("vet.problem", [("status", "=", "active")], "name", "onset_date"),
+            ("vet.medical.note", [("is_important", "=", True)], "summary", "date"),
+        ):
+            Model = self.env[model_name]
+            if not Model.check_access_rights("read", raise_exception=False):
+                continue
+            query = Model._search(
+                [("patient_id", "=", self.id), *domain],
+                limit=CLINICAL_SUMMARY_LIMIT,
+                order=f"{date_fname} desc, id desc",
+            )
+            if query.is_empty():
+                continue
+            queries.append(
+                SQL(
+                    "(%s)",
+                    query.select(
+                        SQL(
+                            "%s::varchar AS model, %s AS id, %s AS title, "
+                            "%s::timestamp AS date",
+                            model_name,
+                            SQL.identifier(Model._table, "id"),
+                            SQL.identifier(Model._table, title),
+                            SQL.identifier(Model._table, date_fname),
+                        )
+                    ),
+                )
+            )
+        if not queries:
+            return []
+        self.env.cr.execute(
+            SQL(
+                "%s ORDER BY model DESC, date DESC NULLS LAST, id DESC",
+                SQL(" UNION ALL ").join(queries),
+            )
+        )
+        return self.env.cr.dictfetchall()
+
+    def _compute_clinical_summary(self):
+        labels = {
+            "vet.problem": _("Active problems"),
+            "vet.medical.note": _("Important notes"),
+        }
+        for patient in self:
+            if not patient._origin:
+                patient.clinical_summary = False
+                continue
+            entries = patient._origin._get_clinical_summary()
+            patient.clinical_summary = (
+                Markup("").join(
+                    Markup("<div><strong>%s:</strong> %s</div>")
+                    % (
+                        labels[model_name],
+                        ", ".join(entry["title"] or "" for entry in group),
+                    )
+                    for model_name, group in groupby(entries, key=lambda e: e["model"])
+                )
+                or False
+            )
+
+    @api.model
+    def quick_find(self, term, limit=20):
+        """Search patients and owners at once, best matches first.
+
+        Matches are found with ``ilike`` on the trigram indexed fields and
+        ranked by word similarity when pg_trgm is available, by prefix match
+        otherwise. Returns dicts with the model, id, name and score.
+        """
+        term = (term or "").strip()
+        if not term:
+            return []
+        pattern = f"%{escape_psql(term)}%"
+        has_trigram = has_extension(self.env.cr, "pg_trgm")
+
+        def field_column(model, fname, query):
+            if model._fields[fname].inherited:
+                # Owner contact fields are stored on their partner
+                return SQL(model._inherits_join_calc(model._table, fname, query))
+            return SQL.identifier(model._table, fname)
+
+        def score(column):
+            if has_trigram:
+                return SQL("word_similarity(%s, %s)", term, column)
+            return SQL("(%s ILIKE %s)::int", column, f"{escape_psql(term)}%")
+
+        sources = [(self, SEARCH_FIELDS), (self.env["vet.owner"], OWNER_SEARCH_FIELDS)]
+        subqueries = []
+        for model, fnames in sources:
+            if not model.check_access_rights("read", raise_exception=False):
+                continue
+            # Record rules are applied to each branch, so that the limit only
+            # counts the rows the user may read
+            query = model._search([])
+            if query.is_empty():
+                continue
+            model.flush_model(fnames)
+            for parent_model in model._inherits:
+                self.env[parent_model].flush_model()
+            columns = [field_column(model, fname, query) for fname in fnames]
+            query.add_where(
+                SQL(" OR ").join(
+                    SQL("%s ILIKE %s", column, pattern) for column in columns
+                )
+            )
+            subqueries.append(
+                SQL(
+                    "(%s)",
+                    query.select(
+                        SQL("%s AS model", model._name),
+                        SQL("%s AS id", SQL.identifier(model._table, "id")),
+                        SQL("%s AS name", field_column(model, "name", query)),
+                        SQL(
+                            "GREATEST(%s) AS score",
+                            SQL(", ").join(score(column) for column in columns),
+                        ),
+                    ),
+                )
+            )
+        if not subqueries:
+            return []
+        self.env.cr.execute(
+            SQL(
+                "%s ORDER BY score DESC, name LIMIT %s",
+                SQL(" UNION ALL ").join(subqueries),
+                limit,
+            )
+        )
+        return self.env.cr.dictfetchall()
+
     @api.depends("birth_date")
     def _compute_age(self):
         """Compute human-readable age string from birth date"""
-        from datetime import date
-
+        today = date.today()
         for patient in self:
             if patient.birth_date:
-                today = date.today()
-                delta = today - patient.birth_date
-                years = delta.days // 365
-                months = (delta.days % 365) // 30
-                if years > 0:
-                    patient.age = f"{years} year(s), {months} month(s)"
+                age = relativedelta(today, patient.birth_date)
+                if age.years > 0:
+                    patient.age = f"{age.years} year(s), {age.months} month(s)"
                 else:
-                    patient.age = f"{months} month(s)"
+                    patient.age = f"{age.months} month(s)"
+                patient.age_in_years = age.years
             else:
                 patient.age = ""
+                patient.age_in_years = 0
+
+    def _search_age_in_years(self, operator, value):
+        """Translate an age condition into a birth date range"""
+        if operator not in AGE_OPERATORS or isinstance(value, bool):
+            raise UserError(_("Unsupported search on age: %s %s", operator, value))
+        today = date.today()
+        years = int(value)
+        # Patients without a birth date are shown as 0 years old
+        matches_unknown = AGE_OPERATORS[operator](0, years)
+
+        def born_before(years):
+            # Patients born on or before this date are at least ``years`` old
+            return today - relativedelta(years=years)
+
+        if operator == ">":
+            operator, years = ">=", years + 1
+        elif operator == "<":
+            operator, years = "<=", years - 1
+        if operator == ">=":
+            age_domain = [("birth_date", "<=", born_before(years))]
+        elif operator == "<=":
+            age_domain = [("birth_date", ">", born_before(years + 1))]
+        elif operator == "=":
+            age_domain = [
+                ("birth_date", "<=", born_before(years)),
+                ("birth_date", ">", born_before(years + 1)),
+            ]
+        else:
+            age_domain = [
+                "|",
+                ("birth_date", ">", born_before(years)),
+                ("birth_date", "<=", born_before(years + 1)),
+            ]
+        if matches_unknown:
+            return expression.OR([[("birth_date", "=", False)], age_domain])
+        return expression.AND([[("birth_date", "!=", False)], age_domain])
+
+    @api.depends(
+        "birth_date",
+        "species_id.juvenile_age_months",
+        "species_id.senior_age_years",
+    )
+    def _compute_age_group(self):
+        today = date.today()
+        for patient in self:
+            species = patient.species_id
+            if not patient.birth_date:
+                patient.age_group = False
+            elif patient.birth_date > today - relativedelta(
+                months=species.juvenile_age_months
+            ):
+                patient.age_group = "juvenile"
+            elif patient.birth_date <= today - relativedelta(
+                years=species.senior_age_years
+            ):
+                patient.age_group = "senior"
+            else:
+                patient.age_group = "adult"
+
+    @api.model
+    def _cron_refresh_age_group(self):
+        """Move the patients that changed age group since the last run.
+
+        Ages change with time only, so the stored buckets are refreshed with a
+        single UPDATE instead of recomputing every patient.
+        """
+        self.flush_model(["birth_date", "species_id", "age_group"])
+        self.env["vet.species"].flush_model(["juvenile_age_months", "senior_age_years"])
+        self.env.cr.execute(
+            SQL(
+                """
+                WITH computed AS (
+                    SELECT p.id,
+                           CASE
+                               WHEN p.birth_date IS NULL THEN NULL
+                               WHEN p.birth_date > %(today)s - make_interval(
+                                   months => COALESCE(s.juvenile_age_months, 0)
+                               ) THEN 'juvenile'
+                               WHEN p.birth_date <= %(today)s - make_interval(
+                                   years => COALESCE(s.senior_age_years, 0)
+                               ) THEN 'senior'
+                               ELSE 'adult'
+                           END AS age_group
+                      FROM vet_patient p
+                      JOIN vet_species s ON s.id = p.species_id
+                )
+                UPDATE vet_patient p
+                   SET age_group = computed.age_group
+                  FROM computed
+                 WHERE computed.id = p.id
+                   AND p.age_group IS DISTINCT FROM computed.age_group
+             RETURNING p.id
+                """,
+                today=date.today(),
+            )
+        )
+        ids = [row[0] for row in self.env.cr.fetchall()]
+        self.browse(ids).invalidate_recordset(["age_group"])
 
     def action_toggle_age_entry_mode(self):
         """Toggle between age entry mode and birth date entry mode"""
@@ -115,12 +746,9 @@ class VetPatient(models.Model):
                 # Switching from birth date entry to age entry
                 # Calculate age from current birth date
                 if patient.birth_date:
-                    from datetime import date
-
-                    today = date.today()
-                    delta = today - patient.birth_date
-                    patient.age_years = delta.days // 365
-                    patient.age_months = (delta.days % 365) // 30
+                    age = relativedelta(date.today(), patient.birth_date)
+                    patient.age_years = age.years
+                    patient.age_months = age.months
                 patient.age_entry_mode = True
 
     @api.onchange("age_years", "age_months")
@@ -131,10 +759,6 @@ class VetPatient(models.Model):
             return
 
         if self.age_years or self.age_months:
-            from datetime import date
-
-            from dateutil.relativedelta import relativedelta
-
             today = date.today()
             years = self.age_years or 0
             months = self.age_months or 0
@@ -180,5 +804,10 @@ class VetPatient(models.Model):
 
     @api.depends("appointment_ids")
     def _compute_appointment_count(self):
+        counts = dict(
+            self.env["vet.appointment"]._read_group(
+                [("patient_id", "in", self.ids)], ["patient_id"], ["__count"]
+            )
+        )
         for patient in self:
-            patient.appointment_count = len(patient.appointment_ids)
+            patient.appointment_count = counts.get(patient._origin, 0)
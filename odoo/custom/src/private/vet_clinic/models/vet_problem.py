@@ -0,0 +1,53 @@
+from odoo import _, api, fields, models
+from odoo.exceptions import ValidationError
+from odoo.tools.sql import create_index
+
+
+class VetProblem(models.Model):
+    _name = "vet.problem"
+    _description = "Patient Problem"
+    _order = "status, onset_date desc, id desc"
+
+    patient_id = fields.Many2one(
+        "vet.patient", string="Patient", required=True, ondelete="cascade"
+    )
+    name = fields.Char(string="Problem", required=True)
+    status = fields.Selection(
+        [
+            ("active", "Active"),
+            ("resolved", "Resolved"),
+        ],
+        default="active",
+        required=True,
+    )
+    onset_date = fields.Date(default=fields.Date.context_today)
+    resolved_date = fields.Date()
+    description = fields.Text()
+
+    def init(self):
+        create_index(
+            self.env.cr,
+            f"{self._table}_patient_id_status_idx",
+            self._table,
+            ["patient_id", "status"],
+        )
+
+    @api.constrains("onset_date", "resolved_date")
+    def _check_dates(self):
+        for problem in self:
+            if (
+                problem.onset_date
+                and problem.resolved_date
+                and problem.resolved_date < problem.onset_date
+            ):
+                raise ValidationError(
+                    _("A problem cannot be resolved before its onset.")
+                )
+
+    def action_resolve(self):
+        self.write(
+            {"status": "resolved", "resolved_date": fields.Date.context_today(self)}
+        )
+
+    def action_reactivate(self):
+        self.write({"status": "active", "resolved_date": False})
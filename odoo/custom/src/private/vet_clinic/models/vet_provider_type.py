@@ -21,3 +21,12 @@ class VetProviderType(models.Model):
     _sql_constraints = [
         ("name_unique", "unique(name)", "Provider type name must be unique!")
     ]
+
+    def write(self, vals):
+        """Sync the provider resources of the users of the types"""
+        result = super().write(vals)
+        if "is_provider" in vals:
+            self.env["res.users"].with_context(active_test=False).search(
+                [("provider_type_id", "in", self.ids)]
+            )._sync_provider_resources()
+        return result
@@ -9,4 +9,14 @@ class VetSpecies(models.Model):
     name = fields.Char(string="Species Name", required=True, translate=True)
     code = fields.Char(size=10)
     description = fields.Text()
+    juvenile_age_months = fields.Integer(
+        string="Juvenile Until (Months)",
+        default=12,
+        help="Patients younger than this are considered juvenile.",
+    )
+    senior_age_years = fields.Integer(
+        string="Senior From (Years)",
+        default=7,
+        help="Patients of this age or older are considered senior.",
+    )
     active = fields.Boolean(default=True)
@@ -0,0 +1,195 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+from odoo import api, fields, models
+from odoo.tools import groupby
+from odoo.tools.sql import SQL, create_index
+
+# Average month length, used to bucket ages for the growth curves
+DAYS_PER_MONTH = 365.25 / 12
+GROWTH_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def _downsample(times, weights, max_points):
+    """Average ``(time, weight)`` samples into at most ``max_points`` time bins"""
+    if len(times) <= max_points:
+        return times, weights
+    edges = np.linspace(times[0], times[-1], max_points + 1)
+    bins = np.clip(np.searchsorted(edges, times, side="right") - 1, 0, max_points - 1)
+    counts = np.bincount(bins, minlength=max_points)
+    filled = counts > 0
+    mean_times = np.bincount(bins, weights=times, minlength=max_points)[filled]
+    mean_weights = np.bincount(bins, weights=weights, minlength=max_points)[filled]
+    return mean_times / counts[filled], mean_weights / counts[filled]
+
+
+class VetWeightMeasurement(models.Model):
+    _name = "vet.weight.measurement"
+    _description = "Weight Measurement"
+    _order = "date desc, id desc"
+
+    patient_id = fields.Many2one(
+        "vet.patient", string="Patient", required=True, ondelete="cascade"
+    )
+    species_id = fields.Many2one(
+        "vet.species",
+        string="Species",
+        related="patient_id.species_id",
+        store=True,
+        index=True,
+    )
+    date = fields.Datetime(required=True, default=fields.Datetime.now)
+    weight = fields.Float(string="Weight (kg)", required=True, digits=(6, 2))
+    appointment_id = fields.Many2one(
+        "vet.appointment",
+        string="Appointment",
+        ondelete="set null",
+        index="btree_not_null",
+        domain="[('patient_id', '=', patient_id)]",
+    )
+    age_days = fields.Integer(
+        string="Age (Days)",
+        compute="_compute_age_days",
+        store=True,
+        help="Age of the patient when measured, used by the growth curves",
+    )
+
+    _sql_constraints = [
+        ("weight_positive", "CHECK(weight > 0)", "The weight must be positive!")
+    ]
+
+    def init(self):
+        create_index(
+            self.env.cr,
+            f"{self._table}_patient_id_date_idx",
+            self._table,
+            ["patient_id", "date"],
+        )
+
+    @api.depends("date", "patient_id.birth_date")
+    def _compute_age_days(self):
+        for measurement in self:
+            birth_date = measurement.patient_id.birth_date
+            if birth_date and measurement.date:
+                measurement.age_days = (measurement.date.date() - birth_date).days
+            else:
+                measurement.age_days = 0
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        measurements = super().create(vals_list)
+        if not self.env.context.get("vet_weight_sync"):
+            measurements._update_patient_weight()
+        return measurements
+
+    def _update_patient_weight(self):
+        """Make the latest measurement the current weight of its patient"""
+        latest = dict(
+            self._read_group(
+                [("patient_id", "in", self.patient_id.ids)],
+                ["patient_id"],
+                ["date:max"],
+            )
+        )
+        updates = {}
+        for patient, measurements in groupby(self, key=lambda m: m.patient_id):
+            measurement = max(measurements, key=lambda m: m.date)
+            if measurement.date >= latest[patient]:
+                updates[patient] = measurement.weight
+        for weight, patients in groupby(updates, key=updates.get):
+            self.env["vet.patient"].union(*patients).with_context(
+                vet_weight_sync=True
+            ).weight = weight
+
+    def _fetch_samples(self, domain, *expressions):
+        """Fetch numeric ``expressions`` of the matching measurements as arrays.
+
+        The expressions are SQL snippets where ``%s`` stands for the table.
+        The rows are read with one query honoring record rules, straight into
+        NumPy arrays without building records.
+        """
+        query = self._search(domain, order="patient_id, date, id")
+        table = SQL.identifier(self._table)
+        self.env.cr.execute(
+            query.select(*(SQL(expression, table) for expression in expressions))
+        )
+        rows = self.env.cr.fetchall()
+        if not rows:
+            return [np.empty(0) for _expression in expressions]
+        return list(np.array(rows, dtype=float).T)
+
+    @api.model
+    def get_weight_series(self, patient_ids, max_points=100):
+        """Return the weight curve of each patient, ready for charting.
+
+        Long histories are averaged into at most ``max_points`` equal time
+        bins. Returns ``{patient_id: {"dates": [...], "weights": [...]}}``.
+        """
+        patient_col, times, weights = self._fetch_samples(
+            [("patient_id", "in", patient_ids)],
+            "%s.patient_id",
+            "EXTRACT(EPOCH FROM %s.date)",
+            "%s.weight",
+        )
+        series = {}
+        boundaries = np.flatnonzero(np.diff(patient_col)) + 1
+        for start, stop in zip(
+            np.r_[0, boundaries], np.r_[boundaries, len(patient_col)], strict=True
+        ):
+            if start == stop:
+                continue
+            sample_times, sample_weights = _downsample(
+                times[start:stop], weights[start:stop], max_points
+            )
+            series[int(patient_col[start])] = {
+                "dates": [
+                    fields.Datetime.to_string(
+                        datetime.fromtimestamp(int(moment), timezone.utc).replace(
+                            tzinfo=None
+                        )
+                    )
+                    for moment in sample_times
+                ],
+                "weights": np.round(sample_weights, 2).tolist(),
+            }
+        return series
+
+    @api.model
+    def get_growth_curves(
+        self, species_id, percentiles=GROWTH_PERCENTILES, max_age_months=24
+    ):
+        """Return weight percentiles per month of age for a species.
+
+        All the measurements of the species taken before ``max_age_months``
+        are fetched at once and bucketed by age in months. Returns
+        ``{"months": [...], "percentiles": {p: [...]}}``, skipping months
+        without measurements.
+        """
+        ages, weights = self._fetch_samples(
+            [
+                ("species_id", "=", species_id),
+                ("patient_id.birth_date", "!=", False),
+                ("age_days", ">=", 0),
+                ("age_days", "<", max_age_months * DAYS_PER_MONTH),
+            ],
+            "%s.age_days",
+            "%s.weight",
+        )
+        months = (ages / DAYS_PER_MONTH).astype(int)
+        order = np.argsort(months, kind="stable")
+        months, weights = months[order], weights[order]
+        buckets, starts = np.unique(months, return_index=True)
+        groups = np.split(weights, starts[1:]) if len(weights) else []
+        values = (
+            np.array([np.percentile(group, percentiles) for group in groups])
+            if groups
+            else np.empty((0, len(percentiles)))
+        )
+        return {
+            "months": buckets.tolist(),
+            "percentiles": {
+                percentile: np.round(values[:, index], 2).tolist()
+                for index, percentile in enumerate(percentiles)
+            },
+        }
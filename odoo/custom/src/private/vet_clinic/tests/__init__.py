@@ -1 +1,8 @@
 from . import test_vet_patient
+from . import test_vet_appointment
+from . import test_vet_appointment_series
+from . import test_vet_appointment_reschedule
+from . import test_vet_weight_measurement
+from . import test_vet_medical_note
+from . import test_res_users
+from . import test_resource_booking
@@ -0,0 +1,57 @@
+from odoo.tests import TransactionCase
+
+
+class TestResUsers(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.doctor = self.env["vet.provider.type"].create(
+            {"name": "Test Doctor", "is_provider": True}
+        )
+        self.receptionist = self.env["vet.provider.type"].create(
+            {"name": "Test Receptionist", "is_provider": False}
+        )
+
+    def _create_users(self, provider_type, count=3):
+        return self.env["res.users"].create(
+            [
+                {
+                    "name": f"Staff {index}",
+                    "login": f"vet_staff_{index}",
+                    "provider_type_id": provider_type.id,
+                }
+                for index in range(count)
+            ]
+        )
+
+    def test_provider_resources(self):
+        """Test provider resources follow the provider status of the users"""
+        users = self._create_users(self.doctor)
+        resources = users.provider_resource_id
+        self.assertEqual(len(resources), 3)
+        self.assertEqual(resources.mapped("name"), users.mapped("name"))
+        self.assertEqual(resources.user_id, users)
+
+        users[0].name = "Dr. Staff"
+        self.assertEqual(users[0].provider_resource_id.name, "Dr. Staff")
+
+        users[1:].provider_type_id = self.receptionist
+        self.assertFalse(users[1:].provider_resource_id)
+        self.assertFalse(resources[1:].exists())
+
+        self.receptionist.is_provider = True
+        self.assertTrue(all(users.mapped("provider_resource_id")))
+
+    def test_shared_provider_resource(self):
+        """Test users sharing a resource are given their own or detached"""
+        users = self._create_users(self.doctor)
+        resource = users[0].provider_resource_id
+        users.provider_resource_id = resource
+        users._sync_provider_resources()
+        self.assertEqual(users[0].provider_resource_id, resource)
+        self.assertEqual(len(users.provider_resource_id), 3)
+
+        users[1].provider_resource_id = resource
+        users[1].provider_type_id = self.receptionist
+        self.assertFalse(users[1].provider_resource_id)
+        self.assertTrue(resource.exists())
+        self.assertEqual(users[0].provider_resource_id, resource)
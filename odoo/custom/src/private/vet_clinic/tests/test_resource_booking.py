@@ -0,0 +1,119 @@
+from psycopg2 import IntegrityError
+
+from odoo.tests import TransactionCase
+from odoo.tools import mute_logger
+
+
+class TestResourceBooking(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        doctor = self.env["vet.provider.type"].create(
+            {"name": "Test Doctor", "is_provider": True}
+        )
+        self.provider = self.env["res.users"].create(
+            {
+                "name": "Dr. Test",
+                "login": "vet_test_doctor",
+                "provider_type_id": doctor.id,
+            }
+        )
+        self.room = self.env["vet.room"].create({"name": "Test Exam Room"})
+        species = self.env["vet.species"].create({"name": "Dog", "code": "DOG"})
+        self.owner = self.env["vet.owner"].create({"name": "Jane Doe"})
+        self.patient = self.env["vet.patient"].create(
+            {"name": "Rex", "owner_id": self.owner.id, "species_id": species.id}
+        )
+        self.booking_type = self.env.ref("vet_clinic.booking_type_checkup")
+        self.Booking = self.env["resource.booking"]
+
+    def _booking_vals(self, **vals):
+        return {
+            "type_id": self.booking_type.id,
+            "patient_id": self.patient.id,
+            "partner_ids": [(6, 0, self.owner.partner_id.ids)],
+            "room_id": self.room.id,
+            "provider_id": self.provider.id,
+            **vals,
+        }
+
+    def test_combination_resource_key(self):
+        """Test combinations are found by their canonical resource key"""
+        resources = self.room.resource_id | self.provider.provider_resource_id
+        combination = self.Booking._get_or_create_combination(self.room, self.provider)
+        self.assertEqual(
+            combination.resource_key, ",".join(map(str, sorted(resources.ids)))
+        )
+        self.assertEqual(
+            self.Booking._get_or_create_combination(self.room, self.provider),
+            combination,
+        )
+        self.assertEqual(
+            self.env["resource.booking.combination"]._find_by_resources(resources),
+            combination,
+        )
+        with mute_logger("odoo.sql_db"), self.assertRaises(IntegrityError):
+            self.env["resource.booking.combination"].create(
+                {"resource_ids": [(6, 0, list(reversed(resources.ids)))]}
+            )
+
+    def test_batch_create(self):
+        """Test bookings created together share their combination and type link"""
+        bookings = self.Booking.create([self._booking_vals() for _index in range(3)])
+        combination = bookings.combination_id
+        self.assertEqual(len(combination), 1)
+        self.assertEqual(
+            combination.resource_ids,
+            self.room.resource_id | self.provider.provider_resource_id,
+        )
+        self.assertEqual(
+            self.env["resource.booking.type.combination.rel"].search_count(
+                [
+                    ("type_id", "=", self.booking_type.id),
+                    ("combination_id", "=", combination.id),
+                ]
+            ),
+            1,
+        )
+        self.assertEqual(
+            bookings.mapped("name"), [f"Rex - {self.booking_type.name}"] * 3
+        )
+
+    def test_partitioned_write(self):
+        """Test a room change gives each booking its own combination"""
+        other_provider = self.env["res.users"].create(
+            {
+                "name": "Dr. Other",
+                "login": "vet_test_other",
+                "provider_type_id": self.provider.provider_type_id.id,
+            }
+        )
+        first, second = self.Booking.create(
+            [
+                self._booking_vals(),
+                self._booking_vals(provider_id=other_provider.id),
+            ]
+        )
+        other_room = self.env["vet.room"].create({"name": "Test Surgery Room"})
+        (first | second).write({"room_id": other_room.id})
+        self.assertNotEqual(first.combination_id, second.combination_id)
+        self.assertEqual(
+            first.combination_id.resource_ids,
+            other_room.resource_id | self.provider.provider_resource_id,
+        )
+        self.assertEqual(
+            second.combination_id.resource_ids,
+            other_room.resource_id | other_provider.provider_resource_id,
+        )
+
+    def test_booking_name(self):
+        """Test booking names follow the patient, type and start"""
+        booking = self.Booking.create(self._booking_vals())
+        self.assertEqual(booking.name, f"Rex - {self.booking_type.name}")
+        self.patient.name = "Rexy"
+        self.assertEqual(booking.name, f"Rex - {self.booking_type.name}")
+        other = self.patient.copy({"name": "Max"})
+        booking.patient_id = other
+        self.assertEqual(booking.name, f"Max - {self.booking_type.name}")
+        self.assertEqual(booking.display_name, booking.name)
+        named = self.Booking.create(self._booking_vals(name="Annual checkup"))
+        self.assertEqual(named.name, "Annual checkup")
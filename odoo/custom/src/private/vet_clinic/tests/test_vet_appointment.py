@@ -0,0 +1,229 @@
+from datetime import timedelta
+
+import pytz
+
+from odoo import fields
+from odoo.exceptions import ValidationError
+from odoo.tests import TransactionCase
+from odoo.tools import mute_logger
+
+from ..models.vet_appointment import _find_pool_slots
+from ..utils import ensure_extension
+
+
+class TestVetAppointment(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        species = self.env["vet.species"].create({"name": "Dog", "code": "DOG"})
+        owner = self.env["vet.owner"].create({"name": "Jane Doe"})
+        self.patient = self.env["vet.patient"].create(
+            {
+                "name": "Rex",
+                "owner_id": owner.id,
+                "species_id": species.id,
+            }
+        )
+        self.room = self.env["vet.room"].create({"name": "Test Exam Room"})
+        self.start = fields.Datetime.now().replace(
+            hour=9, minute=0, second=0, microsecond=0
+        ) + timedelta(days=7)
+
+    def _create_appointment(self, start, duration=0.5, **vals):
+        return self.env["vet.appointment"].create(
+            {
+                "patient_id": self.patient.id,
+                "appointment_date": start,
+                "duration": duration,
+                "room_id": self.room.id,
+                "reason": "Checkup",
+                **vals,
+            }
+        )
+
+    def test_appointment_end(self):
+        """Test the stored end time follows start and duration"""
+        appointment = self._create_appointment(self.start, duration=1.5)
+        self.assertEqual(appointment.appointment_end, self.start + timedelta(hours=1.5))
+        appointment.duration = 0.5
+        self.assertEqual(appointment.appointment_end, self.start + timedelta(hours=0.5))
+
+    def test_room_overlap(self):
+        """Test overlapping appointments in the same room are detected"""
+        first = self._create_appointment(self.start, duration=1.0)
+        second = self._create_appointment(self.start + timedelta(minutes=30))
+        self.assertTrue(second.has_overlap)
+        provider_overlaps, room_overlaps = second._get_overlapping_appointments()
+        self.assertFalse(provider_overlaps)
+        self.assertEqual(room_overlaps, first)
+        self.assertIn(first.name, second.overlap_warning)
+
+    def test_adjacent_appointments_do_not_overlap(self):
+        """Test back-to-back appointments are not flagged"""
+        self._create_appointment(self.start, duration=1.0)
+        second = self._create_appointment(self.start + timedelta(hours=1))
+        self.assertFalse(second.has_overlap)
+        self.assertFalse(second.overlap_warning)
+
+    def test_cancelled_appointment_does_not_overlap(self):
+        """Test cancelled appointments do not block the room"""
+        self._create_appointment(self.start, state="cancelled")
+        second = self._create_appointment(self.start)
+        self.assertFalse(second.has_overlap)
+
+    def test_medical_record(self):
+        """Test the clinical text is stored in a separate medical record"""
+        appointment = self._create_appointment(self.start, diagnosis="Otitis")
+        record = appointment.medical_record_id
+        self.assertEqual(record.reason, "Checkup")
+        self.assertEqual(record.diagnosis, "Otitis")
+        self.assertFalse(appointment._fields["reason"].store)
+        appointment.treatment = "Ear drops"
+        self.assertEqual(record.treatment, "Ear drops")
+        with self.assertRaises(ValidationError):
+            appointment.reason = False
+        copy = appointment.copy()
+        self.assertNotEqual(copy.medical_record_id, record)
+        self.assertEqual(copy.diagnosis, "Otitis")
+        appointment.unlink()
+        self.assertFalse(record.exists())
+
+    def test_batch_overlap_computation(self):
+        """Test has_overlap is computed for a whole batch at once"""
+        first, second, third = self.env["vet.appointment"].create(
+            [
+                {
+                    "patient_id": self.patient.id,
+                    "appointment_date": start,
+                    "duration": 1.0,
+                    "room_id": self.room.id,
+                    "reason": "Checkup",
+                }
+                for start in (
+                    self.start,
+                    self.start + timedelta(minutes=30),
+                    self.start + timedelta(hours=3),
+                )
+            ]
+        )
+        self.assertEqual(
+            (first | second | third).mapped("has_overlap"), [True, True, False]
+        )
+        overlaps = (first | second | third)._get_overlap_map()
+        self.assertEqual(overlaps[first][1], second)
+        self.assertEqual(overlaps[second][1], first)
+        self.assertFalse(overlaps[third][1])
+
+    def test_batch_reference_numbers(self):
+        """Test a batch create draws distinct, consecutive references"""
+        appointments = self.env["vet.appointment"].create(
+            [
+                {
+                    "patient_id": self.patient.id,
+                    "appointment_date": self.start + timedelta(hours=hours),
+                    "reason": "Vaccination",
+                }
+                for hours in range(3)
+            ]
+        )
+        names = appointments.mapped("name")
+        self.assertEqual(len(set(names)), 3)
+        self.assertTrue(all(name.startswith("VET-APP-") for name in names))
+        self.assertEqual(names, sorted(names))
+
+    def test_neighbor_overlap_invalidation(self):
+        """Test the conflict flag of neighbors follows moves, cancels and deletes"""
+        first = self._create_appointment(self.start)
+        second = self._create_appointment(self.start)
+        self.assertTrue(first.has_overlap)
+
+        second.appointment_date = self.start + timedelta(hours=2)
+        self.assertFalse(first.has_overlap)
+
+        third = self._create_appointment(self.start + timedelta(hours=2))
+        self.assertTrue(second.has_overlap)
+
+        third.action_cancel()
+        self.assertFalse(second.has_overlap)
+
+        third.state = "scheduled"
+        self.assertTrue(second.has_overlap)
+
+        third.unlink()
+        self.assertFalse(second.has_overlap)
+
+    def test_prevent_double_booking(self):
+        """Test the database rejects overlapping bookings in hard mode"""
+        if not ensure_extension(self.env.cr, "btree_gist"):
+            self.skipTest("btree_gist is not available")
+        self.env["res.config.settings"].create(
+            {"vet_prevent_double_booking": True}
+        ).execute()
+        self._create_appointment(self.start, duration=1.0)
+        self._create_appointment(self.start + timedelta(hours=1))
+        with mute_logger("odoo.sql_db"), self.assertRaises(ValidationError):
+            self._create_appointment(self.start + timedelta(minutes=30))
+
+    def test_find_pool_slots(self):
+        """Test the free slot sweep over provider and room pools"""
+        hour = timedelta(hours=1)
+        half_hour = timedelta(minutes=30)
+        start = self.start
+        pools = {
+            "provider_id": {1: [(start, start + hour)]},
+            "room_id": {
+                10: [(start, start + 3 * hour)],
+                11: [(start + hour, start + 2 * hour)],
+            },
+        }
+        slots = _find_pool_slots(
+            pools, start, start + 4 * hour, half_hour, half_hour, limit=4
+        )
+        self.assertEqual(
+            [(slot["start"], slot["provider_id"], slot["room_id"]) for slot in slots],
+            [
+                (start + 2 * hour, 1, 11),
+                (start + 2 * hour + half_hour, 1, 11),
+                (start + 3 * hour, 1, 10),
+                (start + 3 * hour + half_hour, 1, 10),
+            ],
+        )
+        self.assertFalse(
+            _find_pool_slots(
+                {"room_id": {}}, start, start + hour, half_hour, half_hour, 4
+            )
+        )
+
+    def test_find_pool_slots_local_grid(self):
+        """Test the slot grid follows the local hours of the clinic"""
+        hour = timedelta(hours=1)
+        # 09:10 UTC is 14:40 in Kolkata (UTC+05:30)
+        start = self.start + timedelta(minutes=10)
+        slots = _find_pool_slots(
+            {"room_id": {10: []}},
+            start,
+            start + 3 * hour,
+            hour,
+            hour,
+            limit=2,
+            tz=pytz.timezone("Asia/Kolkata"),
+        )
+        self.assertEqual(
+            [slot["start"] for slot in slots],
+            [start + timedelta(minutes=20), start + timedelta(minutes=80)],
+        )
+
+    def test_off_hours_without_calendar(self):
+        """Test rooms without working hours follow the company calendar"""
+        Appointment = self.env["vet.appointment"]
+        stop = self.start + timedelta(days=1)
+        resource = self.room.resource_id
+        self.assertEqual(resource.calendar_id, self.env.company.resource_calendar_id)
+        with_calendar = Appointment._get_off_hours(resource, self.start, stop)
+        resource.calendar_id = False
+        without_calendar = Appointment._get_off_hours(resource, self.start, stop)
+        self.assertEqual(without_calendar[resource.id], with_calendar[resource.id])
+        self.env.company.resource_calendar_id = False
+        self.assertEqual(
+            Appointment._get_off_hours(resource, self.start, stop)[resource.id],
+            [(self.start, stop)],
+        )
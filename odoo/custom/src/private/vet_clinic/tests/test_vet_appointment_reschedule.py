@@ -0,0 +1,131 @@
+from datetime import timedelta
+
+from odoo import fields
+from odoo.exceptions import ValidationError
+from odoo.tests import TransactionCase
+
+from ..utils import ensure_extension
+
+
+class TestVetAppointmentReschedule(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        species = self.env["vet.species"].create({"name": "Dog", "code": "DOG"})
+        owner = self.env["vet.owner"].create({"name": "Jane Doe"})
+        self.patient = self.env["vet.patient"].create(
+            {
+                "name": "Rex",
+                "owner_id": owner.id,
+                "species_id": species.id,
+            }
+        )
+        self.room = self.env["vet.room"].create({"name": "Test Exam Room"})
+        self.other_room = self.env["vet.room"].create({"name": "Test Surgery Room"})
+        self.start = fields.Datetime.now().replace(
+            hour=9, minute=0, second=0, microsecond=0
+        ) + timedelta(days=7)
+        self.appointments = self.env["vet.appointment"].create(
+            [
+                {
+                    "patient_id": self.patient.id,
+                    "appointment_date": self.start + timedelta(hours=hours),
+                    "duration": 1.0,
+                    "room_id": self.room.id,
+                    "reason": "Checkup",
+                }
+                for hours in range(3)
+            ]
+        )
+
+    def _reschedule(self, appointments, **vals):
+        return (
+            self.env["vet.appointment.reschedule"]
+            .with_context(active_model="vet.appointment", active_ids=appointments.ids)
+            .create(vals)
+        )
+
+    def test_shift_appointments(self):
+        """Test a back-to-back block can be shifted onto its own slots"""
+        wizard = self._reschedule(self.appointments, shift_hours=1.0)
+        self.assertFalse(wizard.conflict_count)
+        wizard.action_apply()
+        self.assertEqual(
+            self.appointments.mapped("appointment_date"),
+            [self.start + timedelta(hours=hours) for hours in (1, 2, 3)],
+        )
+        self.assertFalse(any(self.appointments.mapped("has_overlap")))
+        notes = self.env["mail.message"].search(
+            [
+                ("model", "=", "vet.appointment"),
+                ("res_id", "in", self.appointments.ids),
+                ("body", "ilike", "Rescheduled 3 appointments"),
+            ]
+        )
+        self.assertEqual(len(notes), 1)
+        self.assertIn("+1:00:00", notes.body)
+
+    def test_shift_appointments_prevent_double_booking(self):
+        """Test a back-to-back block can be shifted in hard mode"""
+        if not ensure_extension(self.env.cr, "btree_gist"):
+            self.skipTest("btree_gist is not available")
+        self.env["res.config.settings"].create(
+            {"vet_prevent_double_booking": True}
+        ).execute()
+        self._reschedule(self.appointments, shift_hours=0.5).action_apply()
+        self.assertEqual(
+            self.appointments.mapped("appointment_date"),
+            [self.start + timedelta(hours=hours + 0.5) for hours in range(3)],
+        )
+        self.assertEqual(
+            self.appointments.mapped("appointment_end"),
+            [self.start + timedelta(hours=hours + 1.5) for hours in range(3)],
+        )
+
+    def test_reassign_room(self):
+        """Test reassigning a selection to another room"""
+        self._reschedule(self.appointments, room_id=self.other_room.id).action_apply()
+        self.assertEqual(self.appointments.room_id, self.other_room)
+
+    def test_conflicts(self):
+        """Test conflicts with the schedule and within the selection are refused"""
+        blocker = self.env["vet.appointment"].create(
+            {
+                "patient_id": self.patient.id,
+                "appointment_date": self.start,
+                "duration": 1.0,
+                "room_id": self.other_room.id,
+                "reason": "Surgery",
+            }
+        )
+        wizard = self._reschedule(self.appointments, room_id=self.other_room.id)
+        self.assertEqual(wizard.conflict_count, 1)
+        with self.assertRaises(ValidationError):
+            wizard.action_apply()
+
+        wizard = self._reschedule(self.appointments[:2], shift_hours=1.0)
+        self.assertEqual(wizard.conflict_count, 1)
+        with self.assertRaises(ValidationError):
+            wizard.action_apply()
+
+        wizard.allow_overlap = True
+        wizard.action_apply()
+        self.assertTrue(self.appointments[2].has_overlap)
+        self.assertFalse(blocker.has_overlap)
+
+    def test_conflicts_within_selection(self):
+        """Test two selected appointments moved onto each other conflict once"""
+        parallel = self.env["vet.appointment"].create(
+            [
+                {
+                    "patient_id": self.patient.id,
+                    "appointment_date": self.start + timedelta(days=1),
+                    "duration": 1.0,
+                    "room_id": room.id,
+                    "reason": "Checkup",
+                }
+                for room in (self.room, self.other_room)
+            ]
+        )
+        third_room = self.env["vet.room"].create({"name": "Test Dental Room"})
+        wizard = self._reschedule(parallel, room_id=third_room.id)
+        self.assertEqual(wizard.conflict_count, 1)
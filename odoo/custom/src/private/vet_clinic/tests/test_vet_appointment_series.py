@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+from odoo import fields
+from odoo.tests import TransactionCase
+
+
+class TestVetAppointmentSeries(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        species = self.env["vet.species"].create({"name": "Dog", "code": "DOG"})
+        owner = self.env["vet.owner"].create({"name": "Jane Doe"})
+        self.patient = self.env["vet.patient"].create(
+            {
+                "name": "Rex",
+                "owner_id": owner.id,
+                "species_id": species.id,
+            }
+        )
+        self.room = self.env["vet.room"].create({"name": "Test Rehab Room"})
+        # Occurrences are computed in the clinic timezone
+        self.env.company.resource_calendar_id.tz = "UTC"
+        self.start = fields.Datetime.now().replace(
+            hour=9, minute=0, second=0, microsecond=0
+        ) + timedelta(days=7)
+        self.series = self.env["vet.appointment.series"].create(
+            {
+                "patient_id": self.patient.id,
+                "appointment_type": "followup",
+                "reason": "Weekly rehab",
+                "room_id": self.room.id,
+                "start": self.start,
+                "rule_type": "weekly",
+                "count": 4,
+            }
+        )
+
+    def test_generate_appointments(self):
+        """Test the occurrences are created from the rule"""
+        self.series.action_generate_appointments()
+        appointments = self.series.appointment_ids.sorted("appointment_date")
+        self.assertEqual(self.series.appointment_count, 4)
+        self.assertEqual(
+            appointments.mapped("appointment_date"),
+            [self.start + timedelta(weeks=week) for week in range(4)],
+        )
+        self.assertEqual(appointments.room_id, self.room)
+        self.assertEqual(self.series.overlap_count, 0)
+
+    def test_update_this_and_following(self):
+        """Test rewriting an occurrence and the following ones"""
+        self.series.action_generate_appointments()
+        first, second, third, fourth = self.series.appointment_ids.sorted(
+            "appointment_date"
+        )
+
+        third.write_following({"duration": 1.0})
+        self.assertEqual((third | fourth).mapped("duration"), [1.0, 1.0])
+        self.assertEqual((first | second).mapped("duration"), [0.5, 0.5])
+
+        third.action_cancel()
+        fourth.weight_ids = [(0, 0, {"patient_id": self.patient.id, "weight": 12.5})]
+        moved = second.write_following(
+            {"appointment_date": second.appointment_date + timedelta(hours=2)}
+        )
+        self.assertEqual(moved, second | fourth)
+        self.assertEqual(self.series.appointment_ids, first | second | third | fourth)
+        self.assertEqual(
+            (first | second | third | fourth).mapped("appointment_date"),
+            [
+                self.start,
+                self.start + timedelta(weeks=1, hours=2),
+                self.start + timedelta(weeks=2),
+                self.start + timedelta(weeks=3, hours=2),
+            ],
+        )
+        self.assertEqual(
+            fourth.appointment_end, fourth.appointment_date + timedelta(hours=1)
+        )
+        self.assertTrue(fourth.weight_ids)
+
+    def test_occurrences_keep_local_time(self):
+        """Test occurrences keep their local time across daylight saving time"""
+        self.env.company.resource_calendar_id.tz = "Europe/Brussels"
+        # 09:00 in Brussels, in winter time, with the switch on 2030-03-31
+        self.series.write({"start": datetime(2030, 3, 20, 8, 0), "count": 3})
+        self.assertEqual(
+            self.series._get_occurrence_dates(),
+            [
+                datetime(2030, 3, 20, 8, 0),
+                datetime(2030, 3, 27, 8, 0),
+                datetime(2030, 4, 3, 7, 0),
+            ],
+        )
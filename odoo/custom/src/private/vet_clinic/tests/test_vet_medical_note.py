@@ -0,0 +1,71 @@
+from odoo.tests import TransactionCase
+
+
+class TestVetMedicalNote(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        species = self.env["vet.species"].create({"name": "Dog", "code": "DOG"})
+        owner = self.env["vet.owner"].create({"name": "Jane Doe"})
+        self.patient = self.env["vet.patient"].create(
+            {
+                "name": "Rex",
+                "owner_id": owner.id,
+                "species_id": species.id,
+            }
+        )
+
+    def test_full_text_search(self):
+        """Test notes are found by the words of their SOAP sections"""
+        sprain, otitis = self.env["vet.medical.note"].create(
+            [
+                {
+                    "patient_id": self.patient.id,
+                    "subjective": "Limping on the front right leg for 2 days.",
+                    "assessment": "Suspected carpus sprain",
+                },
+                {
+                    "patient_id": self.patient.id,
+                    "note_type": "communication",
+                    "content": "<p>Ear infection is <b>resolving</b> well.</p>",
+                },
+            ]
+        )
+        self.assertEqual(sprain.summary, "Suspected carpus sprain")
+        self.assertEqual(otitis.summary, "Ear infection is resolving well.")
+        Note = self.env["vet.medical.note"]
+        self.assertEqual(Note.search([("search_text", "ilike", "limps")]), sprain)
+        self.assertEqual(Note.search([("search_text", "ilike", "resolved")]), otitis)
+        self.assertFalse(Note.search([("search_text", "ilike", "fracture")]))
+
+    def test_clinical_summary(self):
+        """Test the header lists active problems and important notes only"""
+        self.env["vet.problem"].create(
+            [
+                {"patient_id": self.patient.id, "name": "Hip Dysplasia"},
+                {
+                    "patient_id": self.patient.id,
+                    "name": "Otitis",
+                    "status": "resolved",
+                },
+            ]
+        )
+        self.env["vet.medical.note"].create(
+            [
+                {
+                    "patient_id": self.patient.id,
+                    "assessment": "Allergic to penicillin",
+                    "is_important": True,
+                },
+                {"patient_id": self.patient.id, "assessment": "Routine checkup"},
+            ]
+        )
+        entries = self.patient._get_clinical_summary()
+        self.assertEqual(
+            [(entry["model"], entry["title"]) for entry in entries],
+            [
+                ("vet.problem", "Hip Dysplasia"),
+                ("vet.medical.note", "Allergic to penicillin"),
+            ],
+        )
+        self.assertIn("Hip Dysplasia", self.patient.clinical_summary)
+        self.assertNotIn("Otitis", self.patient.clinical_summary)
@@ -1,4 +1,11 @@
+from PIL import Image
+
+from odoo import tools
+from odoo.exceptions import ValidationError
 from odoo.tests import TransactionCase
+from odoo.tools import mute_logger
+
+from ..models.vet_patient import IMAGE_BACKFILL_PARAM, IMAGE_VARIANTS
 
 
 class TestVetPatient(TransactionCase):
@@ -51,6 +58,69 @@ class TestVetPatient(TransactionCase):
         self.assertTrue(patient.age)
         self.assertIn("year", patient.age.lower())
 
+    def test_patient_age_search(self):
+        """Test age searches are translated into birth date ranges"""
+        from datetime import date
+
+        from dateutil.relativedelta import relativedelta
+
+        today = date.today()
+        patients = self.env["vet.patient"].create(
+            [
+                {
+                    "name": name,
+                    "owner_id": self.owner.id,
+                    "species_id": self.species_dog.id,
+                    "birth_date": today - relativedelta(years=years, days=1),
+                }
+                for name, years in (("Puppy", 0), ("Adult", 3), ("Old", 9))
+            ]
+        )
+        self.assertEqual(patients.mapped("age_in_years"), [0, 3, 9])
+        self.assertEqual(patients.mapped("age_group"), ["juvenile", "adult", "senior"])
+        # Patients without a birth date are shown, and found, as 0 years old
+        unknown = patients[0].copy({"name": "Stray", "birth_date": False})
+        self.assertEqual(unknown.age_in_years, 0)
+        patients |= unknown
+        Patient = self.env["vet.patient"].with_context(active_test=False)
+        for domain, expected in (
+            ([("age_in_years", "=", 3)], patients[1]),
+            ([("age_in_years", "=", 0)], patients[0] | unknown),
+            ([("age_in_years", ">=", 3)], patients[1:3]),
+            ([("age_in_years", ">", 3)], patients[2]),
+            ([("age_in_years", "<", 3)], patients[0] | unknown),
+            ([("age_in_years", "<=", 3)], patients[:2] | unknown),
+            ([("age_in_years", "!=", 3)], patients[0] | patients[2] | unknown),
+            ([("age_in_years", "!=", 0)], patients[1:3]),
+        ):
+            self.assertEqual(
+                Patient.search([("id", "in", patients.ids), *domain]),
+                expected,
+                domain,
+            )
+
+    def test_refresh_age_group(self):
+        """Test the cron moves patients into their new age group"""
+        patient = self.env["vet.patient"].create(
+            {
+                "name": "Rocky",
+                "owner_id": self.owner.id,
+                "species_id": self.species_dog.id,
+                "birth_date": "2010-01-01",
+            }
+        )
+        self.assertEqual(patient.age_group, "senior")
+        self.species_dog.senior_age_years = 50
+        self.assertEqual(patient.age_group, "adult")
+        # Simulate an outdated bucket, as left behind by the passing time
+        self.env.cr.execute(
+            "UPDATE vet_patient SET age_group = 'juvenile' WHERE id = %s",
+            [patient.id],
+        )
+        patient.invalidate_recordset(["age_group"])
+        self.env["vet.patient"]._cron_refresh_age_group()
+        self.assertEqual(patient.age_group, "adult")
+
     def test_appointment_count(self):
         """Test appointment count computation"""
         patient = self.env["vet.patient"].create(
@@ -72,3 +142,259 @@ class TestVetPatient(TransactionCase):
             }
         )
         self.assertEqual(patient.appointment_count, 1)
+
+    def test_bulk_mode(self):
+        """Test bulk mode skips tracking and logs one summary per write"""
+        Patient = self.env["vet.patient"].with_context(vet_bulk_mode="silent")
+        patients = Patient.create(
+            [
+                {
+                    "name": name,
+                    "owner_id": self.owner.id,
+                    "species_id": self.species_dog.id,
+                }
+                for name in ("Luna", "Milo")
+            ]
+        )
+        self.assertFalse(patients.message_ids)
+        self.assertFalse(patients.message_follower_ids)
+
+        patients.write({"breed": "Beagle"})
+        self.assertFalse(patients.message_ids)
+
+        patients.with_context(vet_bulk_mode="summary").write({"breed": "Poodle"})
+        message = patients.message_ids
+        self.assertEqual(len(message), 1)
+        self.assertEqual(message.res_id, patients[0].id)
+        self.assertIn("Poodle", message.body)
+        self.assertIn("Luna, Milo", message.body)
+        self.assertFalse(message.tracking_value_ids)
+
+    def test_bulk_summary_scales(self):
+        """Test a summary write costs the same queries for 5 or 100 records"""
+        Patient = self.env["vet.patient"].with_context(vet_bulk_mode="silent")
+        few, many = (
+            Patient.create(
+                [
+                    {
+                        "name": f"Pet {index}",
+                        "owner_id": self.owner.id,
+                        "species_id": self.species_dog.id,
+                    }
+                    for index in range(size)
+                ]
+            )
+            for size in (5, 100)
+        )
+        # Warm up the caches shared by both writes
+        few.with_context(vet_bulk_mode="summary").write({"breed": "Beagle"})
+        query_counts = []
+        for patients in (few, many):
+            self.env.flush_all()
+            self.env.invalidate_all()
+            start = self.cr.sql_log_count
+            patients.with_context(vet_bulk_mode="summary").write({"breed": "Collie"})
+            self.env.flush_all()
+            query_counts.append(self.cr.sql_log_count - start)
+        self.assertEqual(query_counts[0], query_counts[1])
+        message = many.message_ids
+        self.assertEqual(len(message), 1)
+        self.assertIn("and 80 more", message.body)
+        self.assertNotIn(many[-1].name, message.body)
+
+    def test_patient_count(self):
+        """Test the number of pets is counted per owner"""
+        other_owner = self.env["vet.owner"].create({"name": "Jane Roe"})
+        self.env["vet.patient"].create(
+            [
+                {
+                    "name": name,
+                    "owner_id": owner.id,
+                    "species_id": self.species_dog.id,
+                }
+                for name, owner in (
+                    ("Daisy", self.owner),
+                    ("Oscar", self.owner),
+                    ("Toby", other_owner),
+                )
+            ]
+        )
+        self.assertEqual((self.owner | other_owner).mapped("patient_count"), [2, 1])
+
+    def test_owner_partner_sync(self):
+        """Test owners store their contact details on their partner"""
+        owners = self.env["vet.owner"].create(
+            [{"name": "Ann Lee", "city": "Lyon"}, {"name": "Bob Lee", "city": "Nice"}]
+        )
+        self.assertEqual(owners.partner_id.mapped("name"), ["Ann Lee", "Bob Lee"])
+        self.assertEqual(owners.partner_id.mapped("city"), ["Lyon", "Nice"])
+        self.assertFalse(owners._fields["city"].store)
+        owners.write({"city": "Paris", "phone": "+33 1 23 45 67 89"})
+        self.assertEqual(owners.partner_id.mapped("city"), ["Paris", "Paris"])
+        owners[0].partner_id.email = "ann@example.com"
+        self.assertEqual(owners[0].email, "ann@example.com")
+
+    def test_quick_find(self):
+        """Test quick find ranks patients and owners in one list"""
+        patient = self.env["vet.patient"].create(
+            {
+                "name": "Johnny",
+                "owner_id": self.owner.id,
+                "species_id": self.species_dog.id,
+            }
+        )
+        results = self.env["vet.patient"].quick_find("john")
+        found = {(row["model"], row["id"]) for row in results}
+        self.assertIn(("vet.patient", patient.id), found)
+        self.assertIn(("vet.owner", self.owner.id), found)
+        scores = [row["score"] for row in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertFalse(self.env["vet.patient"].quick_find("  "))
+
+    def test_quick_find_record_rules(self):
+        """Test the quick find limit only counts the records the user may read"""
+        self.env["vet.patient"].create(
+            [
+                {
+                    "name": name,
+                    "owner_id": self.owner.id,
+                    "species_id": self.species_dog.id,
+                }
+                for name in ("Zorro Visible", "Zorro Hidden", "Zorro Hidden Too")
+            ]
+        )
+        group = self.env.ref("vet_clinic.group_vet_clinic_user")
+        self.env["ir.rule"].create(
+            {
+                "name": "Hide some patients",
+                "model_id": self.env.ref("vet_clinic.model_vet_patient").id,
+                "groups": [(6, 0, group.ids)],
+                "domain_force": "[('name', 'not ilike', 'hidden')]",
+            }
+        )
+        user = self.env["res.users"].create(
+            {
+                "name": "Restricted",
+                "login": "vet_restricted",
+                "groups_id": [(6, 0, group.ids)],
+            }
+        )
+        results = self.env["vet.patient"].with_user(user).quick_find("zorro", limit=1)
+        self.assertEqual([row["name"] for row in results], ["Zorro Visible"])
+
+    def test_microchip_lookup(self):
+        """Test microchip numbers are normalized, validated and looked up"""
+        patient = self.env["vet.patient"].create(
+            {
+                "name": "Chip",
+                "owner_id": self.owner.id,
+                "species_id": self.species_dog.id,
+                "microchip_number": "982 000-123.456 789",
+            }
+        )
+        self.assertEqual(patient.microchip_number, "982000123456789")
+        with self.assertRaises(ValidationError):
+            patient.microchip_number = "98200012345"
+
+        result = self.env["vet.patient"].microchip_lookup("982000 123456789")
+        self.assertEqual(result["patient"]["id"], patient.id)
+        self.assertEqual(result["owner"]["id"], self.owner.id)
+        self.assertFalse(result["next_appointment"])
+        self.assertFalse(self.env["vet.patient"].microchip_lookup("000000000000000"))
+
+    def test_image_variants(self):
+        """Test resized photos are generated on upload"""
+        image = tools.image_to_base64(Image.new("RGB", (1024, 1024), "red"), "PNG")
+        patient = self.env["vet.patient"].create(
+            {
+                "name": "Snapshot",
+                "owner_id": self.owner.id,
+                "species_id": self.species_dog.id,
+                "image": image,
+            }
+        )
+        for fname, size in (("image_512", 512), ("image_256", 256), ("image_128", 128)):
+            self.assertEqual(
+                tools.base64_to_image(patient[fname]).size, (size, size), fname
+            )
+
+    def test_backfill_image_variants(self):
+        """Test the photo backfill resizes old photos and skips broken ones"""
+        image = tools.image_to_base64(Image.new("RGB", (1024, 1024), "red"), "PNG")
+        patients = self.env["vet.patient"].create(
+            [
+                {
+                    "name": name,
+                    "owner_id": self.owner.id,
+                    "species_id": self.species_dog.id,
+                    "image": image,
+                }
+                for name in ("Broken", "Legacy")
+            ]
+        )
+        Attachment = self.env["ir.attachment"].sudo()
+        domain = [("res_model", "=", "vet.patient"), ("res_id", "in", patients.ids)]
+        Attachment.search([*domain, ("res_field", "in", IMAGE_VARIANTS)]).unlink()
+        Attachment.search(
+            [*domain, ("res_id", "=", patients[0].id), ("res_field", "=", "image")]
+        ).raw = b"not an image"
+        patients.invalidate_recordset()
+        self.env["ir.config_parameter"].sudo().set_param(
+            IMAGE_BACKFILL_PARAM, patients[0].id - 1
+        )
+        with mute_logger("odoo.addons.vet_clinic.models.vet_patient"):
+            self.env["vet.patient"]._cron_backfill_image_variants()
+        self.assertFalse(patients[0].image_128)
+        self.assertEqual(tools.base64_to_image(patients[1].image_128).size, (128, 128))
+
+    def test_timeline(self):
+        """Test the timeline merges sources and pages with a cursor"""
+        from datetime import datetime, timedelta
+
+        patient = self.env["vet.patient"].create(
+            {
+                "name": "Timeline",
+                "owner_id": self.owner.id,
+                "species_id": self.species_dog.id,
+            }
+        )
+        start = datetime(2030, 1, 1, 9, 0)
+        appointments = self.env["vet.appointment"].create(
+            [
+                {
+                    "patient_id": patient.id,
+                    "appointment_date": start + timedelta(days=day),
+                    "reason": "Checkup",
+                }
+                for day in range(3)
+            ]
+        )
+        measurements = self.env["vet.weight.measurement"].create(
+            [
+                {
+                    "patient_id": patient.id,
+                    "weight": weight,
+                    "date": start + timedelta(days=day),
+                }
+                for day, weight in ((0, 10.0), (2, 11.0))
+            ]
+        )
+        entries = []
+        cursor = None
+        while True:
+            page = patient.get_timeline(cursor=cursor, limit=2)
+            self.assertLessEqual(len(page["entries"]), 2)
+            entries += page["entries"]
+            cursor = page["next_cursor"]
+            if not cursor:
+                break
+        self.assertEqual(
+            [(entry["model"], entry["id"]) for entry in entries],
+            [
+                ("vet.weight.measurement", measurements[1].id),
+                ("vet.appointment", appointments[2].id),
+                ("vet.appointment", appointments[1].id),
+                ("vet.weight.measurement", measurements[0].id),
+                ("vet.appointment", appointments[0].id),
+            ],
+        )
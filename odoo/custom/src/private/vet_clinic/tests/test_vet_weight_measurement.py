@@ -0,0 +1,73 @@
+from datetime import date, datetime, timedelta
+
+from odoo.tests import TransactionCase
+
+
+class TestVetWeightMeasurement(TransactionCase):
+    def setUp(self):
+        super().setUp()
+        self.species = self.env["vet.species"].create({"name": "Dog", "code": "DOG"})
+        owner = self.env["vet.owner"].create({"name": "Jane Doe"})
+        self.patient = self.env["vet.patient"].create(
+            {
+                "name": "Rex",
+                "owner_id": owner.id,
+                "species_id": self.species.id,
+                "birth_date": date(2024, 1, 1),
+            }
+        )
+        self.Measurement = self.env["vet.weight.measurement"]
+
+    def test_weight_sync(self):
+        """Test the patient weight and its history follow each other"""
+        self.patient.weight = 12.5
+        self.assertEqual(self.patient.weight_ids.mapped("weight"), [12.5])
+
+        self.Measurement.create(
+            {"patient_id": self.patient.id, "weight": 13.0, "date": datetime.now()}
+        )
+        self.assertEqual(self.patient.weight, 13.0)
+        self.Measurement.create(
+            {
+                "patient_id": self.patient.id,
+                "weight": 9.0,
+                "date": datetime.now() - timedelta(days=30),
+            }
+        )
+        self.assertEqual(self.patient.weight, 13.0)
+        self.assertEqual(len(self.patient.weight_ids), 3)
+
+    def test_weight_series(self):
+        """Test long weight histories are downsampled"""
+        start = datetime(2024, 2, 1)
+        self.Measurement.create(
+            [
+                {
+                    "patient_id": self.patient.id,
+                    "weight": 5.0 + day / 10,
+                    "date": start + timedelta(days=day),
+                }
+                for day in range(100)
+            ]
+        )
+        series = self.Measurement.get_weight_series(self.patient.ids, max_points=10)
+        curve = series[self.patient.id]
+        self.assertEqual(len(curve["dates"]), 10)
+        self.assertEqual(curve["weights"], sorted(curve["weights"]))
+        self.assertAlmostEqual(curve["weights"][0], 5.45)
+
+    def test_growth_curves(self):
+        """Test weight percentiles are computed per month of age"""
+        self.Measurement.create(
+            [
+                {
+                    "patient_id": self.patient.id,
+                    "weight": weight,
+                    "date": datetime(2024, month, 15),
+                }
+                for month, weight in ((2, 4.0), (2, 6.0), (3, 8.0))
+            ]
+        )
+        curves = self.Measurement.get_growth_curves(self.species.id, percentiles=(50,))
+        self.assertEqual(curves["months"], [1, 2])
+        self.assertEqual(curves["percentiles"][50], [5.0, 8.0])
@@ -0,0 +1,154 @@
+import logging
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2 import errors
+
+from odoo import _
+from odoo.exceptions import UserError, ValidationError
+from odoo.tools import str2bool
+from odoo.tools.sql import SQL, constraint_definition, create_index, drop_constraint
+
+_logger = logging.getLogger(__name__)
+
+# ir.config_parameter switching the exclusion constraints on providers/rooms
+DOUBLE_BOOKING_PARAM = "vet_clinic.prevent_double_booking"
+
+
+def has_extension(cr, extension):
+    """Return whether a PostgreSQL extension is enabled"""
+    cr.execute("SELECT 1 FROM pg_extension WHERE extname = %s", [extension])
+    return bool(cr.fetchone())
+
+
+def ensure_extension(cr, extension):
+    """Make sure a PostgreSQL extension is enabled.
+
+    Returns True when the extension is available, False when it could not be
+    created (usually because the database user lacks the privilege).
+    """
+    if has_extension(cr, extension):
+        return True
+    try:
+        with cr.savepoint(flush=False):
+            cr.execute(
+                SQL("CREATE EXTENSION IF NOT EXISTS %s", SQL.identifier(extension))
+            )
+    except psycopg2.Error:
+        _logger.warning(
+            "PostgreSQL extension %s is not available, falling back to plain "
+            "indexes. Ask your database administrator to run "
+            "'CREATE EXTENSION %s'.",
+            extension,
+            extension,
+        )
+        return False
+    return True
+
+
+def create_trigram_indexes(cr, table, columns):
+    """Create the GIN trigram indexes backing ``ilike`` searches on ``columns``"""
+    if not ensure_extension(cr, "pg_trgm"):
+        return
+    for column in columns:
+        create_index(
+            cr,
+            f"{table}_{column}_trgm_idx",
+            table,
+            [f"{column} gin_trgm_ops"],
+            method="gin",
+        )
+
+
+def is_double_booking_prevented(env):
+    """Return whether the no-double-booking hard mode is enabled"""
+    return str2bool(
+        env["ir.config_parameter"].sudo().get_param(DOUBLE_BOOKING_PARAM) or "0"
+    )
+
+
+def update_exclusion_constraints(cr, table, constraints, enabled, raise_if_failed):
+    """Add or drop the given ``(name, definition)`` exclusion constraints.
+
+    Adding a constraint fails when btree_gist is missing or when existing rows
+    already violate it; this raises a UserError if ``raise_if_failed`` is set
+    and only logs a warning otherwise.
+    """
+    for name, definition in constraints:
+        current = constraint_definition(cr, table, name)
+        if current is not None and (not enabled or current != definition):
+            # Constraints made by an older definition are replaced
+            drop_constraint(cr, table, name)
+            current = None
+        if not enabled or current is not None:
+            continue
+        if not ensure_extension(cr, "btree_gist"):
+            if raise_if_failed:
+                raise UserError(
+                    _(
+                        "Preventing double bookings requires the PostgreSQL "
+                        "extension btree_gist."
+                    )
+                )
+            return
+        try:
+            with cr.savepoint(flush=False):
+                cr.execute(
+                    SQL(
+                        "ALTER TABLE %s ADD CONSTRAINT %s %s",
+                        SQL.identifier(table),
+                        SQL.identifier(name),
+                        SQL(definition),
+                    )
+                )
+                # Keep the definition to tell when it changes
+                cr.execute(
+                    SQL(
+                        "COMMENT ON CONSTRAINT %s ON %s IS %s",
+                        SQL.identifier(name),
+                        SQL.identifier(table),
+                        definition,
+                    )
+                )
+        except errors.ExclusionViolation as e:
+            if raise_if_failed:
+                raise UserError(
+                    _(
+                        "Double bookings cannot be prevented while existing "
+                        "appointments overlap. Resolve the conflicts first.\n%s",
+                        e.diag.message_detail,
+                    )
+                ) from e
+            _logger.warning("Table %s: unable to add constraint %s: %s", table, name, e)
+
+
+@contextmanager
+def deferred_constraints(cr, table, names):
+    """Check the ``names`` constraints of ``table`` at the end of the block.
+
+    The constraints must be deferrable. Rows written within the block may
+    temporarily violate them, e.g. when a block of back-to-back appointments
+    is shifted one row at a time.
+    """
+    names = [name for name in names if constraint_definition(cr, table, name)]
+    if not names:
+        yield
+        return
+    constraints = SQL(", ").join(SQL.identifier(name) for name in names)
+    cr.execute(SQL("SET CONSTRAINTS %s DEFERRED", constraints))
+    yield
+    cr.execute(SQL("SET CONSTRAINTS %s IMMEDIATE", constraints))
+
+
+@contextmanager
+def double_booking_guard():
+    """Report exclusion constraint violations as a validation error"""
+    try:
+        yield
+    except errors.ExclusionViolation as e:
+        raise ValidationError(
+            _(
+                "This provider or room is already booked at that time.\n%s",
+                e.diag.message_detail,
+            )
+        ) from e
@@ -0,0 +1 @@
+from . import vet_appointment_reschedule
@@ -0,0 +1,166 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from markupsafe import Markup
+
+from odoo import _, api, fields, models
+from odoo.exceptions import UserError, ValidationError
+
+from ..models.vet_appointment import OVERLAP_IGNORED_STATES
+
+# Number of conflicts listed in the preview and in error messages
+MAX_REPORTED_CONFLICTS = 10
+
+
+class VetAppointmentReschedule(models.TransientModel):
+    _name = "vet.appointment.reschedule"
+    _description = "Reschedule Appointments"
+
+    appointment_ids = fields.Many2many(
+        "vet.appointment",
+        string="Appointments",
+        domain=[("state", "not in", OVERLAP_IGNORED_STATES)],
+        required=True,
+    )
+    shift_days = fields.Integer(string="Shift Days")
+    shift_hours = fields.Float(string="Shift Hours")
+    provider_id = fields.Many2one(
+        "res.users",
+        string="New Provider",
+        domain=[("is_provider", "=", True)],
+        help="Leave empty to keep the current provider of each appointment.",
+    )
+    room_id = fields.Many2one(
+        "vet.room",
+        string="New Room",
+        help="Leave empty to keep the current room of each appointment.",
+    )
+    allow_overlap = fields.Boolean(
+        string="Allow Overlaps",
+        help="Apply the changes even if they create overlapping appointments.",
+    )
+    conflict_count = fields.Integer(compute="_compute_conflicts")
+    conflict_summary = fields.Html(compute="_compute_conflicts")
+
+    @api.model
+    def default_get(self, fields_list):
+        res = super().default_get(fields_list)
+        if (
+            "appointment_ids" in fields_list
+            and self.env.context.get("active_model") == "vet.appointment"
+        ):
+            appointments = self.env["vet.appointment"].browse(
+                self.env.context.get("active_ids", [])
+            )
+            res["appointment_ids"] = [
+                fields.Command.set(
+                    appointments.filtered(
+                        lambda a: a.state not in OVERLAP_IGNORED_STATES
+                    ).ids
+                )
+            ]
+        return res
+
+    @api.depends(
+        "appointment_ids", "shift_days", "shift_hours", "provider_id", "room_id"
+    )
+    def _compute_conflicts(self):
+        for wizard in self:
+            conflicts = wizard._get_conflicts()
+            wizard.conflict_count = len(conflicts)
+            wizard.conflict_summary = wizard._format_conflicts(conflicts)
+
+    def _get_plan(self):
+        """Return the new ``(start, stop, provider_id, room_id)`` of each appointment"""
+        self.ensure_one()
+        delta = timedelta(days=self.shift_days, hours=self.shift_hours)
+        plan = {}
+        for appointment in self.appointment_ids._origin:
+            if not appointment.appointment_date:
+                continue
+            start = appointment.appointment_date + delta
+            plan[appointment] = (
+                start,
+                start + timedelta(hours=max(appointment.duration, 0)),
+                self.provider_id.id or appointment.provider_id.id,
+                self.room_id.id or appointment.room_id.id,
+            )
+        return plan
+
+    def _get_conflicts(self, plan=None):
+        """Return the ``(appointment, conflicting appointment)`` pairs of the plan"""
+        Appointment = self.env["vet.appointment"]
+        pairs = Appointment._get_schedule_conflicts(
+            self._get_plan() if plan is None else plan
+        )
+        return [
+            (Appointment.browse(appointment_id), Appointment.browse(other_id))
+            for appointment_id, other_id in pairs
+        ]
+
+    def _format_conflicts(self, conflicts):
+        if not conflicts:
+            return False
+        lines = Markup("").join(
+            Markup("<li>%s</li>")
+            % _(
+                "%(appointment)s would overlap %(other)s",
+                appointment=appointment.display_name,
+                other=other.display_name,
+            )
+            for appointment, other in conflicts[:MAX_REPORTED_CONFLICTS]
+        )
+        return Markup("<ul>%s</ul>") % lines
+
+    def action_apply(self):
+        """Move the appointments in one go.
+
+        The whole plan is validated upfront, then the appointments sharing the
+        same new values are written together.
+        """
+        self.ensure_one()
+        plan = self._get_plan()
+        if not plan:
+            raise UserError(_("There is no appointment to reschedule."))
+        now = fields.Datetime.now()
+        if any(
+            start < now and appointment.state == "scheduled"
+            for appointment, (start, _stop, _provider, _room) in plan.items()
+        ):
+            raise ValidationError(_("Appointment date cannot be in the past."))
+        if not self.allow_overlap:
+            conflicts = self._get_conflicts(plan)
+            if conflicts:
+                lines = "\n".join(
+                    _(
+                        "%(appointment)s would overlap %(other)s",
+                        appointment=appointment.display_name,
+                        other=other.display_name,
+                    )
+                    for appointment, other in conflicts[:MAX_REPORTED_CONFLICTS]
+                )
+                raise ValidationError(
+                    _(
+                        "The new schedule has %(count)s conflict(s):\n%(lines)s",
+                        count=len(conflicts),
+                        lines=lines,
+                    )
+                )
+
+        # The provider and room changes are the same for all the appointments
+        # and the date shift is applied with a single query
+        batches = defaultdict(lambda: self.env["vet.appointment"])
+        for appointment, (_start, _stop, provider_id, room_id) in plan.items():
+            vals = {}
+            if provider_id != appointment.provider_id.id:
+                vals["provider_id"] = provider_id
+            if room_id != appointment.room_id.id:
+                vals["room_id"] = room_id
+            if vals:
+                batches[tuple(sorted(vals.items()))] |= appointment
+        delta = timedelta(days=self.shift_days, hours=self.shift_hours)
+        self.env["vet.appointment"]._write_batches(
+            [(appointments, dict(vals)) for vals, appointments in batches.items()],
+            shifts=dict.fromkeys(plan, delta) if delta else None,
+        )
+        return {"type": "ir.actions.act_window_close"}